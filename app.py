@@ -1,15 +1,34 @@
 import os
+import sys
+
+# Cooperative I/O must be patched in before requests/psycopg2 are imported.
+# GUNICORN_WORKER_CLASS is exported by gunicorn.conf.py.
+if os.environ.get('GUNICORN_WORKER_CLASS') == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
 from app import create_app
+from app._envutil import env_bool
 
 # Create app instance that can be imported by Gunicorn
 app = create_app()
 
 if __name__ == '__main__':
+    # The Werkzeug development server is single-process and unsuitable for
+    # production traffic; production must be served by Gunicorn (docker/start.sh)
+    if os.environ.get('FLASK_ENV', os.environ.get('ENV', 'development')).lower() == 'production':
+        sys.exit(
+            "Refusing to start the development server with FLASK_ENV=production. "
+            "Run Gunicorn instead: gunicorn --config gunicorn.conf.py wsgi:app"
+        )
+
     # Get configuration from environment variables
-    debug_mode = os.environ.get('DEBUG', 'False').lower() in ('true', 't', '1', 'yes', 'y')
+    debug_mode = env_bool('DEBUG')
     port = int(os.environ.get('PORT', 5000))
     
-    # Run the application
+    print(f"Starting development server on port {port} with debug mode {'enabled' if debug_mode else 'disabled'}")
+
+    # Run the application (blocks until the server stops)
     app.run(host='0.0.0.0', port=port, debug=debug_mode)
-    
-    print(f"Server started on port {port} with debug mode {'enabled' if debug_mode else 'disabled'}")
@@ -0,0 +1,28 @@
+"""
+Environment variable helpers
+"""
+import os
+from functools import lru_cache
+
+TRUTHY_VALUES = frozenset(('true', 't', '1', 'yes', 'y'))
+
+
+@lru_cache(maxsize=None)
+def env_bool(name: str, default: bool = False) -> bool:
+    """
+    Parse a boolean environment variable.
+
+    Values are read once per process and cached, so changes to os.environ
+    after the first lookup are not picked up.
+
+    Args:
+        name: The environment variable name
+        default: Value to use when the variable is not set
+
+    Returns:
+        True if the variable is set to a truthy value, False otherwise
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUTHY_VALUES
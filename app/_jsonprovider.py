@@ -0,0 +1,42 @@
+"""
+JSON provider for Flask responses
+"""
+from datetime import date
+from enum import Enum
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to Flask's stdlib provider
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Serialize responses with orjson when it is installed.
+
+    orjson writes dates and datetimes as ISO 8601 and enums as their values
+    in C, so models can hand them over as-is instead of converting each
+    field. The stdlib fallback formats them the same way (dates rather than
+    as HTTP dates).
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        if isinstance(o, Enum):
+            return o.value
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        # orjson cannot indent by arbitrary amounts, so pretty-printed debug
+        # responses keep using the stdlib encoder
+        if orjson is not None and 'indent' not in kwargs:
+            try:
+                option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+                return orjson.dumps(obj, option=option).decode()
+            except TypeError:
+                # e.g. Decimal or non-str keys; the stdlib encoder handles these
+                pass
+        return super().dumps(obj, **kwargs)
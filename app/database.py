@@ -2,15 +2,69 @@
 Database configuration and SQLAlchemy setup
 """
 import os
+import io
 import json
 import sqlite3
+import time
+import uuid
 from app.extensions import db
-from sqlalchemy.dialects.postgresql import JSON as PostgresJSON
+from app._envutil import env_bool
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.mutable import MutableDict, Mutable
-from sqlalchemy import JSON, TypeDecorator, event, engine
+from sqlalchemy import JSON, TypeDecorator, event, engine, insert
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 import copy
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# orjson options that make it raise instead of converting values the stdlib
+# json module would not round-trip (datetimes, dataclasses, subclasses)
+_ORJSON_STRICT = (
+    orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+) if orjson is not None else 0
+
+
+def json_dumps(value):
+    """Serialize a value to a JSON string, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=_ORJSON_STRICT).decode()
+        except TypeError:
+            # orjson rejects some inputs the stdlib accepts (e.g. non-str keys);
+            # the stdlib then decides, so datetimes still raise TypeError
+            pass
+    return json.dumps(value)
+
+
+def json_loads(value):
+    """Parse a JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+def uuid7():
+    """
+    Generate a time-ordered UUID (version 7).
+    
+    The leading 48 bits are the Unix time in milliseconds, so new primary keys
+    land at the right-hand edge of their indexes instead of at random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | (0x7 << 76)  # version
+    value = value & ~(0x3 << 62) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def new_id():
+    """Return a new primary key for the String(36) id columns"""
+    return str(uuid7())
+
 # Create a base model class
 class Base(db.Model):
     """Base model class that all models will inherit from"""
@@ -22,18 +76,18 @@ class JSONType(TypeDecorator):
     
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
-            return dialect.type_descriptor(PostgresJSON())
+            return dialect.type_descriptor(JSONB())
         else:
             return dialect.type_descriptor(JSON())
     
     def process_bind_param(self, value, dialect):
         if dialect.name == 'sqlite' and value is not None:
-            return json.dumps(value)
+            return json_dumps(value)
         return value
     
     def process_result_value(self, value, dialect):
         if dialect.name == 'sqlite' and value is not None:
-            return json.loads(value)
+            return json_loads(value)
         return value
 
 # Define a mutable dictionary type for JSON fields
@@ -55,12 +109,12 @@ class MutableList(Mutable, list):
     @classmethod
     def coerce(cls, key, value):
         """Convert plain list to MutableList"""
+        if value is None:
+            return cls()
         if isinstance(value, cls):
             return value
         if isinstance(value, list):
             return cls(value)
-        if value is None:
-            return cls([])
         return cls([value])
     
     def __setitem__(self, index, value):
@@ -86,8 +140,11 @@ class MutableList(Mutable, list):
     
     def extend(self, iterable):
         """Detect list extension"""
+        # Works for any iterable (including generators) without consuming it twice
+        length = len(self)
         list.extend(self, iterable)
-        self.changed()
+        if len(self) != length:
+            self.changed()
     
     def insert(self, index, value):
         """Detect item insertion"""
@@ -101,16 +158,23 @@ class MutableList(Mutable, list):
     
     def clear(self):
         """Detect list clearing"""
+        if not self:
+            return
         list.clear(self)
         self.changed()
     
     def sort(self, *args, **kw):
         """Detect list sorting"""
+        # Lists with fewer than two items cannot change order
+        if len(self) < 2:
+            return
         list.sort(self, *args, **kw)
         self.changed()
     
     def reverse(self):
         """Detect list reversal"""
+        if len(self) < 2:
+            return
         list.reverse(self)
         self.changed()
     
@@ -120,19 +184,165 @@ class MutableList(Mutable, list):
     
     def __deepcopy__(self, memo):
         """Provide proper deep copying"""
+        if orjson is not None:
+            try:
+                # A JSON round trip is much faster than copy.deepcopy for plain
+                # JSON data. Datetimes and subclasses (e.g. nested mutables) are
+                # rejected so they fall through to a real deepcopy unchanged.
+                return MutableList(orjson.loads(orjson.dumps(list(self), option=_ORJSON_STRICT)))
+            except TypeError:
+                pass
         return MutableList(copy.deepcopy(list(self), memo))
 
 
 # Create usable type for list fields stored as JSON
 MutableJSONList = MutableList.as_mutable(JSONType)
 
-# Enable SQLite foreign key enforcement
+# PRAGMAs applied to every new SQLite connection (development/testing only;
+# production runs on PostgreSQL). WAL plus synchronous=NORMAL is the usual
+# durability/performance trade-off for a local database file.
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",  # ~20MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+)
+
+
+# Enable SQLite foreign key enforcement and performance settings
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     if isinstance(dbapi_connection, sqlite3.Connection):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+# Batches at least this large are streamed with COPY on PostgreSQL; smaller
+# ones go through a regular multi-row INSERT
+COPY_THRESHOLD = 100
+
+# COPY text format: backslash escapes for the characters that delimit fields
+# and rows, and an unescaped \N for NULL. Escaping every backslash means no
+# real value can ever be read back as \N.
+_COPY_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_COPY_NULL = '\\N'
+
+
+def _copy_text_value(value):
+    """Format a value as a field of COPY's text format"""
+    if value is None:
+        return _COPY_NULL
+    return str(value).translate(_COPY_TEXT_ESCAPES)
+
+
+def _column_default(column):
+    """Evaluate a column's client-side default, or None if it has none"""
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        # SQLAlchemy wraps zero-argument callables to accept an execution context
+        return default.arg(None)
+    return default.arg
+
+
+def bulk_insert(model, rows):
+    """
+    Insert many rows for a model in one round trip and commit.
+    
+    Rows are plain dicts keyed by column name. Large batches on PostgreSQL
+    use COPY, which skips per-row INSERT parsing entirely; everything else
+    uses an executemany INSERT.
+    
+    Args:
+        model: The mapped model class to insert into
+        rows: List of dicts of column values
+        
+    Returns:
+        The number of rows inserted
+    """
+    if not rows:
+        return 0
+    
+    connection = db.session.connection()
+    if connection.dialect.name != 'postgresql' or len(rows) < COPY_THRESHOLD:
+        db.session.execute(insert(model), rows)
+        db.session.commit()
+        return len(rows)
+    
+    # COPY bypasses SQLAlchemy, so client-side defaults and JSON
+    # serialization have to be applied here
+    # Columns the database fills in itself (e.g. created_at) are left out of
+    # the payload unless a row sets them
+    columns = [
+        column for column in model.__table__.columns
+        if column.server_default is None or any(column.key in row for row in rows)
+    ]
+    table = []
+    for row in rows:
+        values = []
+        for column in columns:
+            value = row[column.key] if column.key in row else _column_default(column)
+            if value is not None and isinstance(column.type, JSONType):
+                value = json_dumps(value)
+            values.append(value)
+        table.append(values)
+    
+    # Columns that are NULL in every row (e.g. updated_at) are dropped too
+    kept = [
+        index for index in range(len(columns))
+        if any(values[index] is not None for values in table)
+    ]
+    buffer = io.StringIO()
+    for values in table:
+        buffer.write('\t'.join(_copy_text_value(values[index]) for index in kept))
+        buffer.write('\n')
+    buffer.seek(0)
+    
+    column_names = ', '.join(columns[index].name for index in kept)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {model.__tablename__} ({column_names}) FROM STDIN",
+            buffer
+        )
+    finally:
         cursor.close()
+    db.session.commit()
+    return len(rows)
+
+
+# Connections all web workers together may hold open, kept below PostgreSQL's
+# default max_connections=100 to leave room for migrations and psql sessions
+DEFAULT_DB_MAX_CONNECTIONS = 80
+
+
+def _pool_sizes(app):
+    """
+    Work out pool_size and max_overflow for one worker process.
+    
+    Every Gunicorn worker has its own pool, so the DB_MAX_CONNECTIONS budget
+    is split across GUNICORN_WORKERS (exported by gunicorn.conf.py) with half
+    of each share kept open and half as overflow. DB_POOL_SIZE and
+    DB_MAX_OVERFLOW still override the derived values.
+    """
+    workers = max(1, int(os.environ.get('GUNICORN_WORKERS', 1)))
+    budget = int(os.environ.get('DB_MAX_CONNECTIONS', DEFAULT_DB_MAX_CONNECTIONS))
+    per_worker = max(2, budget // workers)
+    
+    pool_size = int(os.environ.get('DB_POOL_SIZE', (per_worker + 1) // 2))
+    max_overflow = int(os.environ.get('DB_MAX_OVERFLOW', per_worker - (per_worker + 1) // 2))
+    total = workers * (pool_size + max_overflow)
+    if total > budget:
+        app.logger.warning(
+            f"{workers} workers x {pool_size + max_overflow} pooled connections "
+            f"can open {total} connections, above DB_MAX_CONNECTIONS={budget}"
+        )
+    return pool_size, max_overflow
 
 
 def get_db_config_for_app(app):
@@ -151,12 +361,17 @@ def get_db_config_for_app(app):
         
         db_uri = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
         
-        # Production connection pooling settings
+        # Production connection pooling settings. Pre-ping costs an extra
+        # round-trip on every checkout, so it is opt-in via DB_POOL_PRE_PING.
+        pool_size, max_overflow = _pool_sizes(app)
         engine_options = {
-            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
-            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'poolclass': QueuePool,
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
             'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
-            'pool_pre_ping': True
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 5)),
+            'pool_reset_on_return': 'rollback',
+            'pool_pre_ping': env_bool('DB_POOL_PRE_PING')
         }
         
         app.logger.info("Using PostgreSQL database for production")
@@ -166,9 +381,9 @@ def get_db_config_for_app(app):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         db_uri = f"sqlite:///{db_path}"
         
-        # Development connection pooling settings
+        # Development connection pooling settings (a local file cannot
+        # disconnect, so there is no pre-ping)
         engine_options = {
-            'pool_pre_ping': True,
             'connect_args': {'check_same_thread': False}  # Allow multi-threaded access
         }
         
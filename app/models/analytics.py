@@ -1,19 +1,154 @@
-import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple
-from sqlalchemy import String, Integer, Float, DateTime, Date, ForeignKey, func, desc, asc, select, and_
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+import threading
+import time
+from datetime import date as date_type, datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Any, Union, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import String, Integer, Float, DateTime, Date, ForeignKey, Index, event, func, desc, asc, select, and_, update as sql_update
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship, undefer_group
 from app.extensions import db
-from app.database import Base, MutableJSONDict
+from app.database import Base, MutableJSONDict, bulk_insert, new_id
 import json
 
+# Dashboards re-request the same windows, so aggregate/time series results are
+# cached per app (and so per database) for a short while. Committed ORM writes
+# to WebsiteMetrics clear the cache; writes from other processes, or through a
+# raw connection, show up once the entry expires.
+_QUERY_CACHE_TTL = 60
+_QUERY_CACHE_MAX_ENTRIES = 256
+_QUERY_CACHE_EXTENSION = 'website_metrics_cache'
+# session.info flag marking a transaction that wrote WebsiteMetrics rows
+_QUERY_CACHE_DIRTY = 'website_metrics_written'
+
+
+class _QueryCache:
+    """Cached WebsiteMetrics query results for one app"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple, Tuple[float, Any]] = {}
+        # Bumped on invalidation so a query that started before a write does
+        # not store what it read
+        self.version = 0
+    
+    def invalidate(self) -> None:
+        """Drop every cached result"""
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+    
+    def get(self, key: Tuple, compute):
+        """Return the cached result for key, computing and storing it if missing or expired"""
+        entry = self.entries.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        version = self.version
+        value = compute()
+        with self.lock:
+            if version != self.version:
+                return value
+            now = time.monotonic()
+            if len(self.entries) >= _QUERY_CACHE_MAX_ENTRIES:
+                # Drop expired entries first, and everything if that is not enough
+                for stale_key in [k for k, (expires, _) in self.entries.items() if expires <= now]:
+                    del self.entries[stale_key]
+                if len(self.entries) >= _QUERY_CACHE_MAX_ENTRIES:
+                    self.entries.clear()
+            self.entries[key] = (now + _QUERY_CACHE_TTL, value)
+        return value
+
+
+def _query_cache() -> _QueryCache:
+    """Return the WebsiteMetrics query cache of the current app"""
+    extensions = current_app.extensions
+    cache = extensions.get(_QUERY_CACHE_EXTENSION)
+    if cache is None:
+        cache = extensions.setdefault(_QUERY_CACHE_EXTENSION, _QueryCache())
+    return cache
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> date_type:
+    """Parse a 'YYYY-MM-DD' string; callers hit the same few dates repeatedly"""
+    return date_type.fromisoformat(value)
+
+
+def _as_date(value: Union[date_type, str]) -> date_type:
+    """Return value as a date, parsing 'YYYY-MM-DD' strings"""
+    # An exact type check is cheaper than isinstance on this hot path
+    return _parse_date(value) if type(value) is str else value
+
+
+def _with_parsed_dates(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return rows with any string 'date' values converted to dates"""
+    return [
+        dict(row, date=_as_date(row['date'])) if 'date' in row else row
+        for row in rows
+    ]
+
+
+# (trend key, aggregate key, sign) for WebsiteMetrics.calculate_trends
+_TREND_METRICS = (
+    ('impressions_trend', 'impressions', 1),
+    ('clicks_trend', 'clicks', 1),
+    ('visitors_trend', 'visitors', 1),
+    ('ctr_trend', 'ctr', 1),
+    ('bounce_rate_trend', 'avg_bounce_rate', -1),  # Lower is better
+)
+
+
+def _percent_change(current: float, previous: float) -> float:
+    """Percentage change from previous to current, treating growth from zero as 100%"""
+    if previous == 0:
+        return 100.0 if current > 0 else 0.0
+    return ((current - previous) / previous) * 100
+
+
+# Rows fetched per round trip by WebsiteMetrics.get_date_range(stream=True)
+_STREAM_BATCH_SIZE = 1000
+
+# Columns WebsiteMetrics.update may change
+_WEBSITE_METRICS_UPDATABLE_FIELDS = frozenset((
+    'date', 'impressions', 'clicks', 'visitors', 'unique_visitors',
+    'bounce_rate', 'avg_session_duration', 'unique_keywords',
+    'top_keywords', 'top_pages', 'updated_at'
+))
+
+# Columns serialized by WebsiteMetrics.to_dict, in output order; the deferred
+# breakdowns are only included on request
+_WEBSITE_METRICS_SUMMARY_FIELDS = (
+    'id', 'date', 'impressions', 'clicks', 'visitors', 'unique_visitors',
+    'bounce_rate', 'avg_session_duration', 'unique_keywords',
+    'created_at', 'updated_at'
+)
+_WEBSITE_METRICS_FIELDS = (
+    'id', 'date', 'impressions', 'clicks', 'visitors', 'unique_visitors',
+    'bounce_rate', 'avg_session_duration', 'unique_keywords',
+    'top_keywords', 'top_pages', 'created_at', 'updated_at'
+)
+
+
 class WebsiteMetrics(Base):
     """Model for tracking overall website metrics by date"""
     
     __tablename__ = 'website_metrics'
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    date: Mapped[datetime.date] = mapped_column(Date, nullable=False, index=True)
+    # Range aggregates can be answered from this index alone on PostgreSQL;
+    # it also serves plain lookups by date
+    __table_args__ = (
+        Index(
+            'ix_website_metrics_date_covering', 'date',
+            postgresql_include=[
+                'impressions', 'clicks', 'visitors', 'unique_visitors',
+                'bounce_rate', 'avg_session_duration', 'unique_keywords'
+            ]
+        ),
+    )
+    
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
+    date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
     impressions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     clicks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     visitors: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -21,10 +156,12 @@ class WebsiteMetrics(Base):
     bounce_rate: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     avg_session_duration: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # in seconds
     unique_keywords: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
-    top_keywords: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
-    top_pages: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=datetime.now)
+    # The JSON breakdowns are only needed for single-day detail, so range
+    # queries skip them; touching either loads both in one query
+    top_keywords: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict, deferred=True, deferred_group='breakdowns')
+    top_pages: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict, deferred=True, deferred_group='breakdowns')
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     
     def __init__(
         self,
@@ -56,14 +193,8 @@ class WebsiteMetrics(Base):
             top_pages: Dictionary of top performing pages and their metrics
             metrics_id: Unique identifier (generated if not provided)
         """
-        self.id = metrics_id or str(uuid.uuid4())
-        
-        # Handle date string conversion if needed
-        if isinstance(date, str):
-            self.date = datetime.strptime(date, '%Y-%m-%d').date()
-        else:
-            self.date = date
-            
+        self.id = metrics_id or new_id()
+        self.date = _as_date(date)
         self.impressions = impressions
         self.clicks = clicks
         self.visitors = visitors
@@ -74,23 +205,19 @@ class WebsiteMetrics(Base):
         self.top_keywords = top_keywords or {}
         self.top_pages = top_pages or {}
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert metrics to dictionary for serialization"""
-        return {
-            'id': self.id,
-            'date': self.date.isoformat(),
-            'impressions': self.impressions,
-            'clicks': self.clicks,
-            'visitors': self.visitors,
-            'unique_visitors': self.unique_visitors,
-            'bounce_rate': self.bounce_rate,
-            'avg_session_duration': self.avg_session_duration,
-            'unique_keywords': self.unique_keywords,
-            'top_keywords': self.top_keywords,
-            'top_pages': self.top_pages,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    def to_dict(self, include_breakdowns: bool = True) -> Dict[str, Any]:
+        """
+        Convert metrics to dictionary for serialization.
+        
+        Args:
+            include_breakdowns: Include top_keywords and top_pages. They are
+                deferred, so when serializing a list either pass False or
+                load the rows with get_date_range(breakdowns=True); otherwise
+                each row costs an extra SELECT.
+        """
+        fields = _WEBSITE_METRICS_FIELDS if include_breakdowns else _WEBSITE_METRICS_SUMMARY_FIELDS
+        # Dates are left as-is; the app's JSON provider writes them as ISO 8601
+        return {field: getattr(self, field) for field in fields}
     
     def calculate_ctr(self) -> float:
         """Calculate CTR from impressions and clicks"""
@@ -106,13 +233,38 @@ class WebsiteMetrics(Base):
     
     def update(self, **kwargs) -> 'WebsiteMetrics':
         """Update metrics fields"""
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+        values = {key: value for key, value in kwargs.items() if key in _WEBSITE_METRICS_UPDATABLE_FIELDS}
+        if 'date' in values:
+            values['date'] = _as_date(values['date'])
         
+        if values:
+            # A single UPDATE statement; the commit below expires this instance,
+            # so the new values are loaded on next access
+            db.session.execute(
+                sql_update(WebsiteMetrics)
+                .where(WebsiteMetrics.id == self.id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
         db.session.commit()
         return self
     
+    @classmethod
+    def bulk_insert(cls, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many days of metrics at once.
+        
+        Args:
+            rows: Dicts of column values; 'date' may be a 'YYYY-MM-DD' string
+            
+        Returns:
+            The number of rows inserted
+        """
+        count = bulk_insert(cls, _with_parsed_dates(rows))
+        # COPY goes straight to the driver, past the session events below
+        _query_cache().invalidate()
+        return count
+    
     @classmethod
     def get_by_id(cls, metrics_id: str) -> Optional['WebsiteMetrics']:
         """Get metrics by ID"""
@@ -121,30 +273,79 @@ class WebsiteMetrics(Base):
     @classmethod
     def get_by_date(cls, date: Union[datetime.date, str]) -> Optional['WebsiteMetrics']:
         """Get metrics for a specific date"""
-        if isinstance(date, str):
-            date = datetime.strptime(date, '%Y-%m-%d').date()
+        date = _as_date(date)
         
         return db.session.query(cls).filter(cls.date == date).first()
     
     @classmethod
-    def get_date_range(cls, start_date: Union[datetime.date, str], end_date: Union[datetime.date, str]) -> List['WebsiteMetrics']:
-        """Get metrics for a date range"""
-        if isinstance(start_date, str):
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-        if isinstance(end_date, str):
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    def get_date_range(
+        cls,
+        start_date: Union[datetime.date, str],
+        end_date: Union[datetime.date, str],
+        stream: bool = False,
+        breakdowns: bool = False
+    ) -> Union[List['WebsiteMetrics'], Iterator['WebsiteMetrics']]:
+        """
+        Get metrics for a date range.
+        
+        Args:
+            start_date: First date in the range (inclusive)
+            end_date: Last date in the range (inclusive)
+            stream: Return an iterator that fetches rows in batches of
+                _STREAM_BATCH_SIZE instead of a fully loaded list, keeping
+                memory flat for long ranges
+            breakdowns: Load the deferred top_keywords and top_pages in the
+                same query, for callers that serialize them with to_dict()
+        """
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date)
         
-        return db.session.query(cls).filter(
+        query = db.session.query(cls).filter(
             cls.date >= start_date,
             cls.date <= end_date
-        ).order_by(cls.date).all()
+        ).order_by(cls.date)
+        if breakdowns:
+            query = query.options(undefer_group('breakdowns'))
+        if stream:
+            return iter(query.yield_per(_STREAM_BATCH_SIZE))
+        return query.all()
     
     @classmethod
     def get_aggregate_metrics(cls, start_date: Union[datetime.date, str], end_date: Union[datetime.date, str]) -> Dict[str, Any]:
         """Get aggregated metrics for a date range"""
-        metrics_list = cls.get_date_range(start_date, end_date)
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date)
         
-        if not metrics_list:
+        return _query_cache().get(
+            ('aggregate', start_date, end_date),
+            lambda: cls._query_aggregate_metrics(start_date, end_date)
+        )
+    
+    @classmethod
+    def _query_aggregate_metrics(cls, start_date: datetime.date, end_date: datetime.date) -> Dict[str, Any]:
+        """Run the aggregate query for a normalised date range"""
+        # Let the database do the reduction instead of hydrating every row
+        stmt = select(
+            func.count(cls.id),
+            func.sum(cls.impressions),
+            func.sum(cls.clicks),
+            func.sum(cls.visitors),
+            func.sum(cls.bounce_rate * cls.visitors),
+            func.sum(cls.avg_session_duration * cls.visitors),
+            # Approximate unique visitors over the range
+            # This is a simplification; in a real system you'd use a more sophisticated approach
+            func.max(cls.unique_visitors),
+            func.max(cls.unique_keywords)
+        ).where(cls.date.between(start_date, end_date))
+        (row_count, total_impressions, total_clicks, total_visitors,
+         weighted_bounce, weighted_duration, unique_visitors, unique_keywords) = db.session.execute(stmt).one()
+        
+        date_range = {
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat()
+        }
+        
+        if not row_count:
             return {
                 'impressions': 0,
                 'clicks': 0,
@@ -154,30 +355,13 @@ class WebsiteMetrics(Base):
                 'avg_bounce_rate': 0.0,
                 'avg_session_duration': 0,
                 'ctr': 0.0,
-                'date_range': {
-                    'start': start_date.isoformat() if isinstance(start_date, datetime.date) else start_date,
-                    'end': end_date.isoformat() if isinstance(end_date, datetime.date) else end_date
-                }
+                'date_range': date_range
             }
         
-        total_impressions = sum(m.impressions for m in metrics_list)
-        total_clicks = sum(m.clicks for m in metrics_list)
-        total_visitors = sum(m.visitors for m in metrics_list)
-        
         # Calculate weighted averages
-        weighted_bounce = sum(m.bounce_rate * m.visitors for m in metrics_list if m.visitors > 0)
-        weighted_duration = sum(m.avg_session_duration * m.visitors for m in metrics_list if m.visitors > 0)
-        
         avg_bounce_rate = weighted_bounce / total_visitors if total_visitors > 0 else 0
         avg_session_duration = weighted_duration / total_visitors if total_visitors > 0 else 0
         
-        # Approximate unique visitors over the range
-        # This is a simplification; in a real system you'd use a more sophisticated approach
-        unique_visitors = max(m.unique_visitors for m in metrics_list) if metrics_list else 0
-        
-        # Get unique keywords count from the most recent data point
-        unique_keywords = max(m.unique_keywords for m in metrics_list) if metrics_list else 0
-        
         # Calculate overall CTR
         ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
         
@@ -190,27 +374,34 @@ class WebsiteMetrics(Base):
             'avg_bounce_rate': avg_bounce_rate,
             'avg_session_duration': avg_session_duration,
             'ctr': ctr,
-            'date_range': {
-                'start': start_date.isoformat() if isinstance(start_date, datetime.date) else start_date,
-                'end': end_date.isoformat() if isinstance(end_date, datetime.date) else end_date
-            }
+            'date_range': date_range
         }
     
     @classmethod
     def get_time_series_data(cls, start_date: Union[datetime.date, str], end_date: Union[datetime.date, str]) -> Dict[str, List]:
         """Get time series data for charts"""
-        metrics_list = cls.get_date_range(start_date, end_date)
+        start_date = _as_date(start_date)
+        end_date = _as_date(end_date)
         
-        labels = []
-        impressions = []
-        clicks = []
-        visitors = []
+        return _query_cache().get(
+            ('time_series', start_date, end_date),
+            lambda: cls._query_time_series_data(start_date, end_date)
+        )
+    
+    @classmethod
+    def _query_time_series_data(cls, start_date: datetime.date, end_date: datetime.date) -> Dict[str, List]:
+        """Load the chart series for a normalised date range"""
+        # Only the charted columns are selected, so no ORM objects are built
+        rows = db.session.execute(
+            select(cls.date, cls.impressions, cls.clicks, cls.visitors)
+            .where(cls.date.between(start_date, end_date))
+            .order_by(cls.date)
+        ).all()
         
-        for metrics in metrics_list:
-            labels.append(metrics.date.isoformat())
-            impressions.append(metrics.impressions)
-            clicks.append(metrics.clicks)
-            visitors.append(metrics.visitors)
+        labels = [row.date.isoformat() for row in rows]
+        impressions = [row.impressions for row in rows]
+        clicks = [row.clicks for row in rows]
+        visitors = [row.visitors for row in rows]
         
         return {
             'labels': labels,
@@ -222,10 +413,8 @@ class WebsiteMetrics(Base):
     @classmethod
     def calculate_trends(cls, current_period_start: Union[datetime.date, str], current_period_end: Union[datetime.date, str]) -> Dict[str, float]:
         """Calculate trends compared to previous period of same length"""
-        if isinstance(current_period_start, str):
-            current_period_start = datetime.strptime(current_period_start, '%Y-%m-%d').date()
-        if isinstance(current_period_end, str):
-            current_period_end = datetime.strptime(current_period_end, '%Y-%m-%d').date()
+        current_period_start = _as_date(current_period_start)
+        current_period_end = _as_date(current_period_end)
         
         # Calculate previous period
         period_length = (current_period_end - current_period_start).days + 1
@@ -236,18 +425,14 @@ class WebsiteMetrics(Base):
         current_metrics = cls.get_aggregate_metrics(current_period_start, current_period_end)
         previous_metrics = cls.get_aggregate_metrics(previous_period_start, previous_period_end)
         
-        # Calculate percentage changes
-        def calc_percent_change(current, previous):
-            if previous == 0:
-                return 100.0 if current > 0 else 0.0
-            return ((current - previous) / previous) * 100
+        # Calculate percentage changes; a positive sign means "improved"
+        trends = {
+            trend_key: _percent_change(current_metrics[metric_key], previous_metrics[metric_key]) * sign
+            for trend_key, metric_key, sign in _TREND_METRICS
+        }
         
         return {
-            'impressions_trend': calc_percent_change(current_metrics['impressions'], previous_metrics['impressions']),
-            'clicks_trend': calc_percent_change(current_metrics['clicks'], previous_metrics['clicks']),
-            'visitors_trend': calc_percent_change(current_metrics['visitors'], previous_metrics['visitors']),
-            'ctr_trend': calc_percent_change(current_metrics['ctr'], previous_metrics['ctr']),
-            'bounce_rate_trend': calc_percent_change(current_metrics['avg_bounce_rate'], previous_metrics['avg_bounce_rate']) * -1,  # Lower is better
+            **trends,
             'previous_period': {
                 'start': previous_period_start.isoformat(),
                 'end': previous_period_end.isoformat()
@@ -255,12 +440,48 @@ class WebsiteMetrics(Base):
         }
 
 
+# Writes only mark the session; the cache is cleared once they are committed,
+# so no reader can re-cache rows from before the commit in between, and a
+# rolled-back transaction leaves the cache alone
+@event.listens_for(Session, 'after_flush')
+def _mark_flushed_metrics(session, flush_context):
+    """Flag the session when a flush writes WebsiteMetrics rows"""
+    if any(
+        isinstance(instance, WebsiteMetrics)
+        for instance in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info[_QUERY_CACHE_DIRTY] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_bulk_metrics_write(orm_execute_state):
+    """Flag the session for INSERT/UPDATE/DELETE statements on WebsiteMetrics"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is WebsiteMetrics:
+        orm_execute_state.session.info[_QUERY_CACHE_DIRTY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    """Clear cached metrics once a transaction that wrote them commits"""
+    if session.info.pop(_QUERY_CACHE_DIRTY, False) and has_app_context():
+        _query_cache().invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_writes(session):
+    """Drop the write flag of a rolled-back transaction"""
+    session.info.pop(_QUERY_CACHE_DIRTY, None)
+
+
 class PageAnalytics(Base):
     """Model for tracking analytics for individual pages"""
     
     __tablename__ = 'page_analytics'
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     page_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)  # Can be blog post ID or null for non-blog pages
     path: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -275,9 +496,9 @@ class PageAnalytics(Base):
     impressions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     clicks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     position: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    keywords: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)  # Keywords driving traffic to this page
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=datetime.now)
+    keywords: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict, deferred=True)  # Keywords driving traffic to this page
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     
     def __init__(
         self,
@@ -317,16 +538,10 @@ class PageAnalytics(Base):
             position: Average search position
             keywords: Dictionary of keywords driving traffic to this page
         """
-        self.id = str(uuid.uuid4())
+        self.id = new_id()
         self.path = path
         self.title = title
-        
-        # Handle date string conversion if needed
-        if isinstance(date, str):
-            self.date = datetime.strptime(date, '%Y-%m-%d').date()
-        else:
-            self.date = date
-            
+        self.date = _as_date(date)
         self.page_id = page_id
         self.page_views = page_views
         self.unique_page_views = unique_page_views
@@ -339,4 +554,16 @@ class PageAnalytics(Base):
         self.clicks = clicks
         self.position = position
         self.keywords = keywords or {}
-
+    
+    @classmethod
+    def bulk_insert(cls, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many page analytics rows at once.
+        
+        Args:
+            rows: Dicts of column values; 'date' may be a 'YYYY-MM-DD' string
+            
+        Returns:
+            The number of rows inserted
+        """
+        return bulk_insert(cls, _with_parsed_dates(rows))
@@ -1,13 +1,12 @@
-import uuid
 import json
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, delete, func, update as sql_update
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 from sqlalchemy.ext.associationproxy import association_proxy
 from app.extensions import db
-from app.database import Base, MutableJSONDict, MutableJSONList
+from app.database import Base, JSONType, MutableJSONDict, MutableJSONList, bulk_insert, new_id
 
 class ContentStatus(str, Enum):
     """Status values for blog post drafts and versions"""
@@ -23,15 +22,15 @@ class BlogPostSection(Base):
     
     __tablename__ = 'blog_post_sections'
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     post_id: Mapped[str] = mapped_column(String(36), ForeignKey('blog_posts.id', ondelete='CASCADE'))
     order: Mapped[int] = mapped_column(db.Integer, nullable=False)
     section_type: Mapped[str] = mapped_column(String(50), nullable=False, default="content")  # header, subheader, content, list, quote, etc.
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     section_metadata: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     
     # Relationship with blog post
     post = relationship("BlogPost", back_populates="sections")
@@ -46,7 +45,7 @@ class BlogPostSection(Base):
         section_metadata: Optional[Dict[str, Any]] = None,
         section_id: Optional[str] = None
     ):
-        self.id = section_id or str(uuid.uuid4())
+        self.id = section_id or new_id()
         self.post_id = post_id
         self.order = order
         self.section_type = section_type
@@ -74,13 +73,13 @@ class BlogPostVersion(Base):
     
     __tablename__ = 'blog_post_versions'
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     post_id: Mapped[str] = mapped_column(String(36), ForeignKey('blog_posts.id', ondelete='CASCADE'))
     version_number: Mapped[int] = mapped_column(db.Integer, nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default=ContentStatus.DRAFT.value)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     version_metadata: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
     
     # Relationship with blog post
@@ -96,7 +95,7 @@ class BlogPostVersion(Base):
         version_metadata: Optional[Dict[str, Any]] = None,
         version_id: Optional[str] = None
     ):
-        self.id = version_id or str(uuid.uuid4())
+        self.id = version_id or new_id()
         self.post_id = post_id
         self.version_number = version_number
         self.title = title
@@ -132,8 +131,8 @@ class BlogPostSEOData(Base):
     seo_score: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
     readability_score: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
     analysis_data: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     
     # Relationship with blog post
     post = relationship("BlogPost", back_populates="seo_data", uselist=False)
@@ -177,6 +176,15 @@ class BlogPostSEOData(Base):
         }
 
 
+# Columns BlogPost.update may change
+_BLOG_POST_UPDATABLE_FIELDS = frozenset((
+    'title', 'content', 'topic', 'keywords', 'published', 'updated_at',
+    'published_at', 'generation_metadata', 'status', 'current_version',
+    'has_outline', 'outline_json', 'target_audience', 'content_purpose',
+    'quality_score', 'last_autosave'
+))
+
+
 class BlogPost(Base):
     """Model for blog posts with CRUD operations"""
     
@@ -184,14 +192,14 @@ class BlogPost(Base):
     
     __tablename__ = 'blog_posts'
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     topic: Mapped[str] = mapped_column(String(100), nullable=False)
     keywords: Mapped[str] = mapped_column(String(255), nullable=True)
     published: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     generation_metadata: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
     
@@ -199,7 +207,7 @@ class BlogPost(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default=ContentStatus.DRAFT.value)
     current_version: Mapped[int] = mapped_column(db.Integer, nullable=False, default=1)
     has_outline: Mapped[bool] = mapped_column(Boolean, default=False)
-    outline_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    outline_json: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)  # Parsed outline (JSONB on PostgreSQL)
     target_audience: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     content_purpose: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     quality_score: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
@@ -237,7 +245,7 @@ class BlogPost(Base):
             published_at: Publishing timestamp
             generation_metadata: Additional metadata about the post generation
         """
-        self.id = post_id or str(uuid.uuid4())
+        self.id = post_id or new_id()
         self.title = title
         self.content = content
         self.topic = topic
@@ -268,15 +276,53 @@ class BlogPost(Base):
         db.session.commit()
         return self
     
+    @classmethod
+    def create_with_sections(cls, post: 'BlogPost', sections: List[Dict[str, Any]]) -> 'BlogPost':
+        """
+        Save a new blog post together with its sections in one transaction.
+        
+        The sections are written with a single multi-row insert rather than
+        one INSERT per BlogPostSection.
+        
+        Args:
+            post: The unsaved blog post
+            sections: Dicts of BlogPostSection column values ('content' is
+                required); 'order' defaults to the position in the list
+            
+        Returns:
+            The saved blog post
+        """
+        db.session.add(post)
+        # The post row has to exist before its sections reference it
+        db.session.flush()
+        
+        rows = [
+            dict(section, post_id=post.id, order=section.get('order', index))
+            for index, section in enumerate(sections)
+        ]
+        if rows:
+            bulk_insert(BlogPostSection, rows)
+        else:
+            db.session.commit()
+        return post
+    
     def update(self, **kwargs) -> 'BlogPost':
         """Update blog post fields"""
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+        # Unknown keys are ignored, as are the id and creation timestamp
+        values = {key: value for key, value in kwargs.items() if key in _BLOG_POST_UPDATABLE_FIELDS}
         
-        if 'published' in kwargs and kwargs['published'] and not self.published_at:
-            self.published_at = datetime.now()
+        if values.get('published') and not self.published_at and 'published_at' not in values:
+            values['published_at'] = datetime.now()
         
+        if values:
+            # A single UPDATE statement; the commit below expires this instance,
+            # so the new values are loaded on next access
+            db.session.execute(
+                sql_update(BlogPost)
+                .where(BlogPost.id == self.id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
         db.session.commit()
         return self
     
@@ -286,11 +332,18 @@ class BlogPost(Base):
         db.session.commit()
         return True
     
-    def publish(self) -> 'BlogPost':
-        """Mark the blog post as published"""
+    def publish(self, commit: bool = True) -> 'BlogPost':
+        """
+        Mark the blog post as published
+        
+        Args:
+            commit: Commit straight away (default True). Pass False to leave
+                    the change for the caller's commit, e.g. a scheduler batch
+        """
         self.published = True
         self.published_at = datetime.now()
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
     
     @classmethod
@@ -299,23 +352,60 @@ class BlogPost(Base):
         return db.session.get(cls, post_id)
     
     @classmethod
-    def get_all(cls) -> List['BlogPost']:
+    def _query(cls, eager: bool = False):
+        """
+        Base query for post lists.
+        
+        With eager=True the sections, versions and SEO data are loaded up front
+        with one extra SELECT ... IN query per relationship, instead of one
+        lazy query per post when callers touch them.
+        """
+        query = db.session.query(cls)
+        if eager:
+            query = query.options(
+                selectinload(cls.sections),
+                selectinload(cls.versions),
+                selectinload(cls.seo_data)
+            )
+        return query
+    
+    @classmethod
+    def get_all(cls, eager: bool = False) -> List['BlogPost']:
         """Get all blog posts"""
-        return db.session.query(cls).all()
+        return cls._query(eager).all()
+    
+    @classmethod
+    def _by_published(
+        cls,
+        published: bool,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        eager: bool = False
+    ) -> List['BlogPost']:
+        """Get posts by published flag, optionally paginated"""
+        # One statement shape for both flags, so they share a compiled-cache entry
+        query = cls._query(eager).filter(cls.published == published).order_by(cls.created_at.desc(), cls.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+        return query.all()
     
     @classmethod
-    def get_published(cls) -> List['BlogPost']:
-        """Get all published blog posts"""
-        return db.session.query(cls).filter_by(published=True).all()
+    def get_published(cls, limit: Optional[int] = None, offset: Optional[int] = None, eager: bool = False) -> List['BlogPost']:
+        """Get published blog posts, newest first"""
+        return cls._by_published(True, limit, offset, eager)
     
     @classmethod
-    def get_drafts(cls) -> List['BlogPost']:
-        """Get all draft blog posts"""
-        return db.session.query(cls).filter_by(published=False).all()
+    def get_drafts(cls, limit: Optional[int] = None, offset: Optional[int] = None, eager: bool = False) -> List['BlogPost']:
+        """Get draft blog posts, newest first"""
+        return cls._by_published(False, limit, offset, eager)
     
     @classmethod
     def clear_all(cls) -> None:
         """Clear all blog posts from the database (mainly for testing)"""
-        db.session.query(cls).delete()
+        # Sections, versions and SEO data go with them via ON DELETE CASCADE,
+        # so nothing needs loading into the session
+        db.session.execute(delete(cls).execution_options(synchronize_session=False))
         db.session.commit()
 
@@ -1,14 +1,70 @@
-import uuid
+import copy
+import threading
+import time
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any, Type, TypeVar
-from sqlalchemy import String, Text, Boolean, DateTime, Integer, Float, Enum as SQLEnum
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Type, TypeVar
+from sqlalchemy import String, Text, DateTime, Enum as SQLEnum, Index, bindparam, delete, func, select
 from sqlalchemy.orm import Mapped, mapped_column
+from flask import current_app
 from app.extensions import db
-from app.database import Base, MutableJSONDict
+from app.database import Base, JSONType
 
 T = TypeVar('T')
 
+# Settings are read far more often than they are written, so typed values are
+# cached per app (and so per database). Writes through the model clear the
+# cache; writes from other processes show up once the entries expire.
+_CONFIG_CACHE_TTL = 30
+_CONFIG_CACHE_EXTENSION = 'configuration_cache'
+_MISSING = object()
+
+
+class _ConfigCache:
+    """Cached typed configuration values for one app"""
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+        # key -> (expires, value), filled by single-key reads
+        self.values: Dict[str, Tuple[float, Any]] = {}
+        # {key: value} of every configuration, filled by get_all_dict
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.snapshot_expires = 0.0
+        # Bumped on invalidation so readers that started before a write do
+        # not store what they read
+        self.generation = 0
+    
+    def invalidate(self) -> None:
+        """Drop every cached value"""
+        with self.lock:
+            self.values.clear()
+            self.generation += 1
+            self.snapshot = None
+            self.snapshot_expires = 0.0
+    
+    def fresh_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Return the snapshot of every configuration, if still fresh"""
+        with self.lock:
+            if time.monotonic() < self.snapshot_expires:
+                return self.snapshot
+        return None
+
+
+def _config_cache() -> _ConfigCache:
+    """Return the configuration cache of the current app"""
+    extensions = current_app.extensions
+    cache = extensions.get(_CONFIG_CACHE_EXTENSION)
+    if cache is None:
+        cache = extensions.setdefault(_CONFIG_CACHE_EXTENSION, _ConfigCache())
+    return cache
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy JSON values so callers never share the cached dict or list"""
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
 
 class ConfigValueType(Enum):
     """Type of configuration value"""
@@ -18,26 +74,62 @@ class ConfigValueType(Enum):
     BOOLEAN = "bool"
     JSON = "json"
 
+
+# Typed value readers by value type. value_data holds the JSON-encoded value;
+# these only coerce what JSON cannot tell apart. They work on Configuration
+# objects and on plain rows selected with the same column names.
+_VALUE_COERCE = {
+    ConfigValueType.STRING: lambda v: v,
+    ConfigValueType.INTEGER: lambda v: v,
+    ConfigValueType.FLOAT: lambda v: float(v) if v is not None else None,
+    # Older rows and SQLite may hand back 1/0
+    ConfigValueType.BOOLEAN: lambda v: bool(v) if v is not None else None,
+    ConfigValueType.JSON: lambda v: v if v else {},
+}
+
+
+# Value type for each Python type accepted by set_value
+_VALUE_TYPES = {
+    str: ConfigValueType.STRING,
+    bool: ConfigValueType.BOOLEAN,
+    int: ConfigValueType.INTEGER,
+    float: ConfigValueType.FLOAT,
+    dict: ConfigValueType.JSON,
+    list: ConfigValueType.JSON,
+}
+
+
+def _row_value(row) -> Any:
+    """Decode the typed value of a configuration object or plain row"""
+    return _VALUE_COERCE[row.value_type](row.value_data)
+
+
 class Configuration(Base):
     """Model for storing application configuration settings"""
     
     __tablename__ = 'configurations'
+    __table_args__ = (
+        # Prefix lookups use LIKE 'prefix%'. The primary key index only serves
+        # those under the C collation on PostgreSQL, so add a pattern_ops index
+        # there. SQLite's case-insensitive LIKE cannot use an index anyway.
+        Index(
+            'ix_configurations_key_pattern', 'key',
+            postgresql_ops={'key': 'varchar_pattern_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     
     key: Mapped[str] = mapped_column(String(255), primary_key=True)
-    value_string: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    value_int: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    value_float: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    value_bool: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
-    value_json: Mapped[Optional[Dict[str, Any]]] = mapped_column(MutableJSONDict, nullable=True)
+    # The value itself, JSON-encoded; use the value property for typed access
+    value_data: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)
     value_type: Mapped[ConfigValueType] = mapped_column(SQLEnum(ConfigValueType), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     @property
     def value(self) -> Any:
         """Get the current value with appropriate type"""
-        return self.get_value()
+        return _row_value(self)
 
     @value.setter
     def value(self, value: Any) -> None:
@@ -54,8 +146,6 @@ class Configuration(Base):
             description: Optional description of the configuration
         """
         self.key = key
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
         self.description = description
         
         # Set value with appropriate type detection
@@ -64,11 +154,7 @@ class Configuration(Base):
         else:
             # Default initialization
             self.value_type = ConfigValueType.STRING
-            self.value_string = None
-            self.value_int = None
-            self.value_float = None
-            self.value_bool = None
-            self.value_json = None
+            self.value_data = None
     
     @classmethod
     def get_value(cls, key: str, default: Any = None) -> Any:
@@ -82,11 +168,10 @@ class Configuration(Base):
         Returns:
             The configuration value or the default value
         """
-        config = cls.get(key)
-        if config is None:
+        value = cls._cached_value(key)
+        if value is _MISSING or value is None:
             return default
-        value = config.get_value()
-        return value if value is not None else default
+        return _copy_value(value)
     
     @classmethod
     def get(cls, key: str) -> Optional['Configuration']:
@@ -100,10 +185,57 @@ class Configuration(Base):
         """
         return db.session.get(cls, key)
     
+    @classmethod
+    def _cached_value(cls, key: str) -> Any:
+        """
+        Get the typed value for key through the app's cache.
+        
+        Returns _MISSING when the key does not exist. The cached object
+        itself is returned, so callers must copy JSON values before handing
+        them out.
+        """
+        cache = _config_cache()
+        entry = cache.values.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        snapshot = cache.fresh_snapshot()
+        if snapshot is not None:
+            return snapshot.get(key, _MISSING)
+        
+        generation = cache.generation
+        row = db.session.execute(_SELECT_VALUE_BY_KEY, {'key': key}).first()
+        value = _row_value(row) if row is not None else _MISSING
+        with cache.lock:
+            if generation == cache.generation:
+                cache.values[key] = (time.monotonic() + _CONFIG_CACHE_TTL, value)
+        return value
+    
+    @classmethod
+    def get_many(cls, keys: Iterable[str]) -> Dict[str, 'Configuration']:
+        """
+        Get several configurations by key in one query.
+        
+        Use this instead of calling get() in a loop, e.g. when assembling a
+        settings screen.
+        
+        Args:
+            keys: The configuration keys
+            
+        Returns:
+            A dictionary of the configurations found, keyed by key; missing
+            keys are left out
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {config.key: config for config in db.session.scalars(_SELECT_BY_KEYS, {'keys': keys})}
+    
     def save(self) -> 'Configuration':
         """Save the configuration to the database"""
         db.session.add(self)
         db.session.commit()
+        _config_cache().invalidate()
         return self
     
     @classmethod
@@ -143,6 +275,7 @@ class Configuration(Base):
             
         db.session.delete(config)
         db.session.commit()
+        _config_cache().invalidate()
         
         return True
     
@@ -164,8 +297,17 @@ class Configuration(Base):
         Returns:
             A dictionary of all configuration values
         """
-        configs = cls.get_all()
-        return {config.key: config.value for config in configs}
+        cache = _config_cache()
+        snapshot = cache.fresh_snapshot()
+        if snapshot is None:
+            generation = cache.generation
+            # Plain rows are enough here; no Configuration objects are needed
+            snapshot = {row.key: _row_value(row) for row in db.session.execute(_SELECT_VALUES)}
+            with cache.lock:
+                if generation == cache.generation:
+                    cache.snapshot = snapshot
+                    cache.snapshot_expires = time.monotonic() + _CONFIG_CACHE_TTL
+        return {key: _copy_value(value) for key, value in snapshot.items()}
     
     @classmethod
     def get_by_prefix(cls, prefix: str) -> List['Configuration']:
@@ -178,7 +320,23 @@ class Configuration(Base):
         Returns:
             A list of configuration objects with the specified prefix
         """
-        return db.session.query(cls).filter(cls.key.startswith(prefix)).all()
+        return db.session.scalars(_SELECT_BY_PREFIX, {'prefix': prefix}).all()
+    
+    @classmethod
+    def get_by_prefix_rows(cls, prefix: str) -> List[Any]:
+        """
+        Get the raw stored values of all configurations with a specific prefix.
+        
+        Returns plain rows rather than Configuration objects, for callers that
+        only need the values.
+        
+        Args:
+            prefix: The prefix to filter by
+            
+        Returns:
+            A list of rows with key, value_type and value_data
+        """
+        return db.session.execute(_SELECT_VALUES_BY_PREFIX, {'prefix': prefix}).all()
         
     @classmethod
     def get_by_prefix_dict(cls, prefix: str) -> Dict[str, Any]:
@@ -191,8 +349,11 @@ class Configuration(Base):
         Returns:
             A dictionary of configuration values with the specified prefix
         """
-        configs = cls.get_by_prefix(prefix)
-        return {config.key: config.value for config in configs}
+        snapshot = _config_cache().fresh_snapshot()
+        if snapshot is not None:
+            return {key: _copy_value(value) for key, value in snapshot.items() if key.startswith(prefix)}
+        
+        return {row.key: _row_value(row) for row in cls.get_by_prefix_rows(prefix)}
     
     @classmethod
     def get_typed(cls, key: str, type_: Type[T], default: Optional[T] = None) -> Optional[T]:
@@ -207,12 +368,8 @@ class Configuration(Base):
         Returns:
             The configuration value or the default value
         """
-        config = cls.get(key)
-        if config is None:
-            return default
-            
-        value = config.value
-        if value is None:
+        value = cls._cached_value(key)
+        if value is _MISSING or value is None:
             return default
             
         try:
@@ -221,59 +378,35 @@ class Configuration(Base):
                 return value.lower() in ('true', 'yes', 'y', '1', 'on')
             
             # Try regular type conversion
-            return type_(value)
+            return type_(_copy_value(value))
         except (ValueError, TypeError):
             return default
     
-    def get_value(self) -> Any:
-        """Get the value with the appropriate type"""
-        if self.value_type == ConfigValueType.STRING:
-            return self.value_string
-        elif self.value_type == ConfigValueType.INTEGER:
-            return self.value_int
-        elif self.value_type == ConfigValueType.FLOAT:
-            return self.value_float
-        elif self.value_type == ConfigValueType.BOOLEAN:
-            # Convert integer to bool for SQLite compatibility
-            return bool(self.value_bool) if self.value_bool is not None else None
-        elif self.value_type == ConfigValueType.JSON:
-            return self.value_json if self.value_json else {}
-        else:
-            # Default to string
-            return self.value_string
-    
     def set_value(self, value: Any) -> None:
         """Set the value with the appropriate type"""
-        # Reset all value fields
-        self.value_string = None
-        self.value_int = None
-        self.value_float = None
-        self.value_bool = None
-        self.value_json = None
-        
-        # Set the value based on its type
         if value is None:
             self.value_type = ConfigValueType.STRING
-            self.value_string = None
-        elif isinstance(value, str):
-            self.value_type = ConfigValueType.STRING
-            self.value_string = value
-        elif isinstance(value, int):
-            self.value_type = ConfigValueType.INTEGER
-            self.value_int = value
-        elif isinstance(value, float):
-            self.value_type = ConfigValueType.FLOAT
-            self.value_float = value
-        elif isinstance(value, bool):
-            self.value_type = ConfigValueType.BOOLEAN
-            self.value_bool = bool(value)  # Ensure it's stored as a proper boolean
-        elif isinstance(value, (dict, list)):
-            self.value_type = ConfigValueType.JSON
-            self.value_json = value
-        else:
+            self.value_data = None
+            return
+        
+        value_type = _VALUE_TYPES.get(type(value))
+        if value_type is None:
+            # Subclasses such as MutableDict; bool comes before int in the table
+            # so True and False are stored as booleans rather than integers
+            value_type = next(
+                (entry for py_type, entry in _VALUE_TYPES.items() if isinstance(value, py_type)),
+                None
+            )
+        if value_type is None:
             # Try to convert to string if no other type matches
-            self.value_type = ConfigValueType.STRING
-            self.value_string = str(value)
+            value_type = ConfigValueType.STRING
+            value = str(value)
+        elif value_type == ConfigValueType.JSON:
+            # Store a plain copy; in-place changes to the argument are not tracked
+            value = dict(value) if isinstance(value, dict) else list(value)
+        
+        self.value_type = value_type
+        self.value_data = value
 
     @classmethod
     def get_group(cls, group_prefix: str, remove_prefix: bool = True) -> Dict[str, Any]:
@@ -286,8 +419,7 @@ class Configuration(Base):
         Returns:
             A dictionary of configuration values in the specified group
         """
-        configs = cls.get_by_prefix(group_prefix)
-        result = {config.key: config.value for config in configs}
+        result = cls.get_by_prefix_dict(group_prefix)
         
         if not remove_prefix:
             return result
@@ -312,19 +444,28 @@ class Configuration(Base):
         Returns:
             A dictionary of the created/updated configuration objects
         """
+        # Ensure the prefix ends with a separator
+        if group_prefix and not group_prefix.endswith('.'):
+            group_prefix += '.'
+        
+        full_values = {f"{group_prefix}{key}": value for key, value in values.items()}
+        if not full_values:
+            return {}
+        
+        # Fetch the existing rows in one query and write everything in one commit
+        existing = cls.get_many(full_values)
+        
         result = {}
-        for key, value in values.items():
-            # Ensure the prefix ends with a separator
-            if group_prefix and not group_prefix.endswith('.'):
-                group_prefix += '.'
-                
-            # Create the full key
-            full_key = f"{group_prefix}{key}"
-            
-            # Set the configuration
-            config = cls.set(full_key, value, description)
+        for full_key, value in full_values.items():
+            config = existing.get(full_key) or cls(key=full_key)
+            config.set_value(value)
+            if description:
+                config.description = description
+            db.session.add(config)
             result[full_key] = config
-            
+        
+        db.session.commit()
+        _config_cache().invalidate()
         return result
     
     @classmethod
@@ -338,12 +479,20 @@ class Configuration(Base):
         Returns:
             The number of deleted configuration items
         """
-        configs = db.session.query(cls).filter(cls.key.startswith(group_prefix)).all()
-        count = len(configs)
-        
-        for config in configs:
-            db.session.delete(config)
-            
+        result = db.session.execute(
+            delete(cls)
+            .where(cls.key.startswith(group_prefix))
+            .execution_options(synchronize_session=False)
+        )
         db.session.commit()
-        return count
+        _config_cache().invalidate()
+        return result.rowcount
+
 
+# Constant-shape statements, built once so each call only binds parameters
+# and SQLAlchemy reuses the compiled form
+_SELECT_VALUES = select(Configuration.key, Configuration.value_type, Configuration.value_data)
+_SELECT_VALUE_BY_KEY = _SELECT_VALUES.where(Configuration.key == bindparam('key'))
+_SELECT_VALUES_BY_PREFIX = _SELECT_VALUES.where(Configuration.key.startswith(bindparam('prefix')))
+_SELECT_BY_PREFIX = select(Configuration).where(Configuration.key.startswith(bindparam('prefix')))
+_SELECT_BY_KEYS = select(Configuration).where(Configuration.key.in_(bindparam('keys', expanding=True)))
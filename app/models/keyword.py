@@ -1,11 +1,10 @@
-import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
-from sqlalchemy import String, Integer, Float, DateTime, ForeignKey, Table, Column
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, String, Integer, Float, DateTime, ForeignKey, Index, Table, Column, Computed, and_, bindparam, event, exists, func, inspect, select, update as sql_update
+from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property, undefer, selectinload, raiseload
 from app.extensions import db
-from app.database import Base, MutableJSONDict
+from app.database import Base, MutableJSONDict, new_id
 
 # Association table for the many-to-many relationship between keywords and blog posts
 keyword_blog_association = Table(
@@ -15,6 +14,20 @@ keyword_blog_association = Table(
     Column('blog_post_id', String(36), ForeignKey('blog_posts.id', ondelete='CASCADE'), primary_key=True)
 )
 
+# Click-through rate as a percentage rounded to 2 places; keep in step with _ctr
+_CTR_EXPRESSION = (
+    "CASE WHEN impressions > 0 "
+    "THEN ROUND(COALESCE(clicks, 0) * 100.0 / impressions, 2) ELSE 0 END"
+)
+
+
+def _ctr(impressions: Optional[int], clicks: Optional[int]) -> float:
+    """Click-through rate as a percentage rounded to 2 places"""
+    if not impressions:
+        return 0.0
+    return round((clicks or 0) / impressions * 100, 2)
+
+
 class KeywordStatus(str, Enum):
     """Status values for keywords"""
     ACTIVE = "active"
@@ -28,19 +41,20 @@ class Keyword(Base):
     
     __tablename__ = 'keywords'
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     keyword: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, index=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default=KeywordStatus.RESEARCH.value)
     search_volume: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     keyword_difficulty: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, onupdate=func.now())
     
     # Analytics metrics
     impressions: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=0)
     clicks: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=0)
-    ctr: Mapped[Optional[float]] = mapped_column(Float, nullable=True, default=0.0)
+    # Computed by the database from impressions and clicks, so it never goes stale
+    ctr: Mapped[Optional[float]] = mapped_column(Float, Computed(_CTR_EXPRESSION, persisted=True))
     position: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     position_change: Mapped[Optional[float]] = mapped_column(Float, nullable=True, default=0.0)
     
@@ -76,7 +90,7 @@ class Keyword(Base):
             keyword_id: Unique identifier (generated if not provided)
             metadata: Additional metadata about the keyword
         """
-        self.id = keyword_id or str(uuid.uuid4())
+        self.id = keyword_id or new_id()
         self.keyword = keyword
         self.status = status
         self.search_volume = search_volume
@@ -86,6 +100,7 @@ class Keyword(Base):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert keyword to dictionary for serialization"""
+        # Timestamps are left as-is; the app's JSON provider writes them as ISO 8601
         return {
             'id': self.id,
             'keyword': self.keyword,
@@ -98,10 +113,10 @@ class Keyword(Base):
             'ctr': self.ctr,
             'position': self.position,
             'position_change': self.position_change,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'metadata': self.keyword_metadata,
-            'blogsCount': len(self.blog_posts)
+            'blogsCount': self.blog_posts_count
         }
     
     def save(self) -> 'Keyword':
@@ -113,7 +128,8 @@ class Keyword(Base):
     def update(self, **kwargs) -> 'Keyword':
         """Update keyword fields"""
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            # ctr is computed by the database and cannot be written
+            if hasattr(self, key) and key != 'ctr':
                 setattr(self, key, value)
         
         db.session.commit()
@@ -125,40 +141,75 @@ class Keyword(Base):
         db.session.commit()
         return True
     
+    def _blog_post_link(self, blog_post):
+        """WHERE clause matching the association row between this keyword and blog_post"""
+        return and_(
+            keyword_blog_association.c.keyword_id == self.id,
+            keyword_blog_association.c.blog_post_id == blog_post.id
+        )
+    
     def add_blog_post(self, blog_post) -> 'Keyword':
         """Add a blog post to this keyword"""
-        if blog_post not in self.blog_posts:
-            self.blog_posts.append(blog_post)
+        # Probe the association table instead of loading the whole collection;
+        # the commit expires self.blog_posts if it was already loaded
+        db.session.add_all((self, blog_post))
+        linked = db.session.scalar(select(exists().where(self._blog_post_link(blog_post))))
+        if not linked:
+            db.session.execute(
+                keyword_blog_association.insert().values(keyword_id=self.id, blog_post_id=blog_post.id)
+            )
             db.session.commit()
         return self
     
     def remove_blog_post(self, blog_post) -> 'Keyword':
         """Remove a blog post from this keyword"""
-        if blog_post in self.blog_posts:
-            self.blog_posts.remove(blog_post)
+        result = db.session.execute(
+            keyword_blog_association.delete().where(self._blog_post_link(blog_post))
+        )
+        if result.rowcount:
             db.session.commit()
         return self
     
     def calculate_ctr(self) -> float:
-        """Calculate CTR based on impressions and clicks"""
-        if not self.impressions or self.impressions == 0:
-            return 0.0
-        ctr = (self.clicks or 0) / self.impressions * 100
-        self.ctr = round(ctr, 2)
-        return self.ctr
+        """
+        Calculate CTR based on impressions and clicks.
+        
+        The stored ctr column is computed by the database; this gives the same
+        value for unsaved changes.
+        """
+        return _ctr(self.impressions, self.clicks)
     
     def update_metrics(self, impressions: int, clicks: int, position: float = None) -> 'Keyword':
-        """Update all metrics at once"""
-        old_position = self.position
+        """Update all metrics at once; the database recomputes ctr"""
+        unchanged = (
+            impressions == self.impressions
+            and clicks == self.clicks
+            and (position is None or position == self.position)
+        )
+        if unchanged:
+            return self
         
-        self.impressions = impressions
-        self.clicks = clicks
+        values = {'impressions': impressions, 'clicks': clicks}
         if position is not None:
-            self.position = position
-            if old_position is not None:
-                self.position_change = old_position - position  # Positive = improved, Negative = dropped
-            
-        self.calculate_ctr()
+            values['position'] = position
+            if self.position is not None:
+                values['position_change'] = self.position - position  # Positive = improved, Negative = dropped
+        
+        if not inspect(self).persistent:
+            # No row to UPDATE yet; the values go in with the INSERT instead
+            for name, value in values.items():
+                setattr(self, name, value)
+            db.session.commit()
+            return self
+        
+        # A single UPDATE statement; the commit below expires this instance,
+        # so the new values are loaded on next access
+        db.session.execute(
+            sql_update(Keyword)
+            .where(Keyword.id == self.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
         db.session.commit()
         return self
     
@@ -170,48 +221,109 @@ class Keyword(Base):
     @classmethod
     def get_by_keyword(cls, keyword_text: str) -> Optional['Keyword']:
         """Get a keyword by its text"""
-        return db.session.query(cls).filter(cls.keyword == keyword_text).first()
+        return db.session.scalars(_SELECT_BY_KEYWORD, {'keyword': keyword_text}).first()
     
     @classmethod
-    def get_all(cls) -> List['Keyword']:
+    def list_query(cls, eager: bool = False):
+        """
+        Base query for keyword lists.
+        
+        Loads blog_posts_count in the same SELECT, since to_dict needs it for
+        every row. With eager=True the linked blog posts are loaded with one
+        extra SELECT ... IN query, and any other relationship access raises
+        instead of lazy loading per keyword.
+        """
+        query = db.session.query(cls).options(undefer(cls.blog_posts_count))
+        if eager:
+            query = query.options(selectinload(cls.blog_posts), raiseload('*'))
+        return query
+    
+    @classmethod
+    def get_all(cls, eager: bool = False) -> List['Keyword']:
         """Get all keywords"""
-        return db.session.query(cls).all()
+        return cls.list_query(eager).all()
     
     @classmethod
-    def get_by_status(cls, status: str) -> List['Keyword']:
+    def get_by_status(cls, status: str, eager: bool = False) -> List['Keyword']:
         """Get keywords by status"""
-        return db.session.query(cls).filter_by(status=status).all()
+        stmt = _SELECT_BY_STATUS
+        if eager:
+            stmt = stmt.options(selectinload(cls.blog_posts), raiseload('*'))
+        return db.session.scalars(stmt, {'status': status}).all()
     
     @classmethod
-    def get_top_performing(cls, limit: int = 10) -> List['Keyword']:
+    def get_top_performing(cls, limit: int = 10, eager: bool = False) -> List['Keyword']:
         """Get top performing keywords by clicks"""
-        return db.session.query(cls).order_by(cls.clicks.desc()).limit(limit).all()
+        return cls.list_query(eager).order_by(cls.clicks.desc().nullslast()).limit(limit).all()
     
     @classmethod
-    def search(cls, query: str) -> List['Keyword']:
+    def search(cls, query: str, eager: bool = False) -> List['Keyword']:
         """Search keywords containing the query string"""
         search_pattern = f"%{query}%"
-        return db.session.query(cls).filter(cls.keyword.ilike(search_pattern)).all()
+        return cls.list_query(eager).filter(cls.keyword.ilike(search_pattern)).all()
     
     @classmethod
     def get_performance_data(cls) -> Dict[str, Any]:
         """Get aggregated performance data for analytics"""
-        keywords = cls.get_all()
-        total_impressions = sum(k.impressions or 0 for k in keywords)
-        total_clicks = sum(k.clicks or 0 for k in keywords)
+        # Let the database do the reduction instead of hydrating every keyword
+        total_keywords, total_impressions, total_clicks = db.session.execute(
+            select(func.count(cls.id), func.sum(cls.impressions), func.sum(cls.clicks))
+        ).one()
+        total_impressions = total_impressions or 0
+        total_clicks = total_clicks or 0
+        
+        status_counts = dict(db.session.execute(
+            select(cls.status, func.count(cls.id)).group_by(cls.status)
+        ).all())
         
         avg_ctr = 0
         if total_impressions > 0:
             avg_ctr = (total_clicks / total_impressions) * 100
             
         return {
-            'total_keywords': len(keywords),
+            'total_keywords': total_keywords,
             'total_impressions': total_impressions,
             'total_clicks': total_clicks,
             'average_ctr': round(avg_ctr, 2),
             'keywords_by_status': {
-                status.value: len([k for k in keywords if k.status == status.value])
+                status.value: status_counts.get(status.value, 0)
                 for status in KeywordStatus
             }
         }
 
+
+# Number of linked blog posts, counted in SQL rather than by loading the
+# collection. Deferred so single-keyword lookups only pay for it on access.
+Keyword.blog_posts_count = column_property(
+    select(func.count(keyword_blog_association.c.blog_post_id))
+    .where(keyword_blog_association.c.keyword_id == Keyword.id)
+    .correlate_except(keyword_blog_association)
+    .scalar_subquery(),
+    deferred=True
+)
+
+# Serves ORDER BY clicks DESC NULLS LAST ... LIMIT n for the top keyword lists,
+# so PostgreSQL reads the first n index entries instead of sorting the table.
+# SQLite cannot declare NULLS LAST in an index and sorts these small tables.
+Index('ix_keywords_clicks_desc', Keyword.clicks.desc().nullslast()).ddl_if(dialect='postgresql')
+
+# Lets PostgreSQL answer Keyword.search's ILIKE '%term%' from a trigram index
+# rather than scanning every keyword. SQLite keeps scanning.
+Index(
+    'ix_keywords_keyword_trgm', Keyword.keyword,
+    postgresql_using='gin',
+    postgresql_ops={'keyword': 'gin_trgm_ops'}
+).ddl_if(dialect='postgresql')
+event.listen(
+    Keyword.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+# Constant-shape statements, built once so each call only binds parameters
+# and SQLAlchemy reuses the compiled form
+_SELECT_BY_KEYWORD = select(Keyword).where(Keyword.keyword == bindparam('keyword'))
+_SELECT_BY_STATUS = (
+    select(Keyword)
+    .options(undefer(Keyword.blog_posts_count))
+    .where(Keyword.status == bindparam('status'))
+)
@@ -1,11 +1,11 @@
-import uuid
-from datetime import datetime
+from calendar import monthrange
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import Dict, Iterator, List, Optional, Any, Union
+from sqlalchemy import String, Text, Boolean, CheckConstraint, DateTime, ForeignKey, Index, TypeDecorator, bindparam, exists, func, select, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 from app.extensions import db
-from app.database import Base, MutableJSONDict
+from app.database import Base, MutableJSONDict, new_id
 
 
 class ScheduleStatus(Enum):
@@ -24,19 +24,168 @@ class ScheduleFrequency(Enum):
     MONTHLY = "monthly"
 
 
+# String forms accepted for each member, by value and by name, so the
+# common spellings resolve with one dict lookup
+_FREQUENCY_BY_STR = {
+    **{frequency.value: frequency for frequency in ScheduleFrequency},
+    **{frequency.name: frequency for frequency in ScheduleFrequency},
+}
+_STATUS_BY_STR = {
+    **{status.value: status for status in ScheduleStatus},
+    **{status.name: status for status in ScheduleStatus},
+}
+
+
+def _to_frequency(frequency: Union[ScheduleFrequency, str]) -> ScheduleFrequency:
+    """Resolve a frequency given as an enum member or a case-insensitive string"""
+    if not isinstance(frequency, str):
+        return frequency
+    member = _FREQUENCY_BY_STR.get(frequency) or _FREQUENCY_BY_STR.get(frequency.lower())
+    if member is None:
+        raise ValueError(f"Unsupported frequency: {frequency}")
+    return member
+
+
+def _to_status(status: Union[ScheduleStatus, str]) -> ScheduleStatus:
+    """Resolve a status given as an enum member or a case-insensitive string"""
+    if not isinstance(status, str):
+        return status
+    member = _STATUS_BY_STR.get(status) or _STATUS_BY_STR.get(status.lower())
+    if member is None:
+        raise ValueError(f"Invalid status: {status}")
+    return member
+
+
+class _EnumValue(TypeDecorator):
+    """
+    Enum stored as its plain value in a VARCHAR column.
+    
+    Members are written as their values and read back through the given
+    string lookup, so class-level comparisons and filter_by() take either
+    members or their string forms.
+    """
+    impl = String(16)
+    cache_ok = True
+    
+    def __init__(self, enum_class: type, lookup: Dict[str, Enum]):
+        super().__init__()
+        # Only enum_class is part of the cache key; lookup is derived from it
+        self.enum_class = enum_class
+        self._lookup = lookup
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value.__class__ is str:
+            member = self._lookup.get(value) or self._lookup.get(value.lower())
+            if member is None:
+                raise ValueError(f"Invalid {self.enum_class.__name__}: {value}")
+            return member.value
+        return value.value
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._lookup[value]
+
+
+# Rows fetched per round trip when streaming pending or due items
+_STREAM_BATCH_SIZE = 200
+
+
+def _scalars(stmt, params: Dict[str, Any], stream: bool):
+    """Run a select of scheduled items as a list, or as a batched iterator when streaming"""
+    if stream:
+        return iter(db.session.scalars(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE), params))
+    return db.session.scalars(stmt, params).all()
+
+
+# How many failures mark_failed keeps in schedule_metadata['errors']
+_MAX_RECORDED_ERRORS = 10
+
+# Backoff delays for the default retry budget, indexed by attempt. Items with
+# a larger max_retries fall back to computing the delay.
+_FAILURE_BACKOFFS = tuple(timedelta(minutes=5 * 3 ** attempt) for attempt in range(3))
+_RETRY_BACKOFFS = tuple(timedelta(minutes=5 * 2 ** attempt) for attempt in range(3))
+
+
+def _backoff(delays: tuple, factor: int, attempt: int) -> timedelta:
+    """Delay before the given retry attempt, growing by factor from 5 minutes"""
+    if attempt < len(delays):
+        return delays[attempt]
+    return timedelta(minutes=5 * factor ** attempt)
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    """Move a datetime by whole months, clamping the day to the target month's length"""
+    month_index = moment.month - 1 + months
+    year, month = moment.year + month_index // 12, month_index % 12 + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, monthrange(year, month)[1]))
+
+
+# Next occurrence of a recurring schedule: the count-th one after
+# scheduled_time, or the first one after now if the schedule has fallen behind
+def _next_daily(scheduled_time: datetime, count: int, now: datetime) -> datetime:
+    return scheduled_time + timedelta(days=max(count, (now - scheduled_time).days + 1))
+
+
+def _next_weekly(scheduled_time: datetime, count: int, now: datetime) -> datetime:
+    return scheduled_time + timedelta(weeks=max(count, (now - scheduled_time).days // 7 + 1))
+
+
+def _next_monthly(scheduled_time: datetime, count: int, now: datetime) -> datetime:
+    months = (now.year - scheduled_time.year) * 12 + now.month - scheduled_time.month
+    if _add_months(scheduled_time, months) <= now:
+        months += 1
+    return _add_months(scheduled_time, max(count, months))
+
+
+# One-off schedules have no next occurrence
+_NEXT_OCCURRENCE = {
+    ScheduleFrequency.DAILY: _next_daily,
+    ScheduleFrequency.WEEKLY: _next_weekly,
+    ScheduleFrequency.MONTHLY: _next_monthly,
+}
+
+
 class ScheduledItem(Base):
     """Model for scheduled publishing of blog and social media posts"""
     
     __tablename__ = 'scheduled_items'
+    __table_args__ = (
+        # get_due_items takes a range on next_execution over pending rows only.
+        # A partial index stays as small as the pending backlog however much
+        # finished history the table accumulates.
+        Index(
+            'ix_scheduled_items_pending_next_execution', 'next_execution',
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'")
+        ),
+        # Exactly one of the two post references is set
+        CheckConstraint(
+            '(blog_post_id IS NULL) <> (social_post_id IS NULL)',
+            name='ck_scheduled_items_single_target'
+        ),
+        # Covers every write path, including raw and Core inserts. A CHECK
+        # cannot compare against now(), so save() and update() keep their
+        # stricter "in the future" ValueError for callers of the model.
+        CheckConstraint('scheduled_time > created_at', name='ck_scheduled_items_future_time'),
+    )
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     
     # Schedule metadata
     scheduled_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    frequency: Mapped[ScheduleFrequency] = mapped_column(SQLEnum(ScheduleFrequency), default=ScheduleFrequency.ONCE)
-    status: Mapped[ScheduleStatus] = mapped_column(SQLEnum(ScheduleStatus), default=ScheduleStatus.PENDING)
+    # Stored as the plain enum values, read back as enum members
+    frequency: Mapped[ScheduleFrequency] = mapped_column(
+        _EnumValue(ScheduleFrequency, _FREQUENCY_BY_STR), nullable=False, default=ScheduleFrequency.ONCE
+    )
+    status: Mapped[ScheduleStatus] = mapped_column(
+        _EnumValue(ScheduleStatus, _STATUS_BY_STR), nullable=False, default=ScheduleStatus.PENDING
+    )
     
-    # Execution tracking
+    # Execution tracking. Pending items always carry a next_execution; it is
+    # only cleared once an item is completed, failed or cancelled.
     last_executed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     next_execution: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     execution_count: Mapped[int] = mapped_column(default=0)
@@ -49,11 +198,15 @@ class ScheduledItem(Base):
     
     # Additional metadata
     schedule_metadata: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    # The Python default keeps created_at on the same local clock as
+    # scheduled_time; the server default fills it for raw inserts so the
+    # future-time CHECK never compares against NULL
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, server_default=func.now())
     
     # Foreign keys - only one of these should be set
-    blog_post_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey('blog_posts.id'), nullable=True)
-    social_post_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey('social_posts.id'), nullable=True)
+    # Indexed for get_by_blog_post/get_by_social_post and the post relationships
+    blog_post_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey('blog_posts.id'), nullable=True, index=True)
+    social_post_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey('social_posts.id'), nullable=True, index=True)
     
     # Relationships
     blog_post = relationship("BlogPost", back_populates="schedules")
@@ -91,7 +244,7 @@ class ScheduledItem(Base):
         if blog_post_id and social_post_id:
             raise ValueError("Cannot schedule both a blog post and a social post with the same schedule")
         
-        self.id = schedule_id or str(uuid.uuid4())
+        self.id = schedule_id or new_id()
         self.scheduled_time = scheduled_time
         self.blog_post_id = blog_post_id
         self.social_post_id = social_post_id
@@ -99,23 +252,9 @@ class ScheduledItem(Base):
         # Calculate next execution
         self.next_execution = scheduled_time
         
-        # Convert string frequency to Enum if necessary
-        if isinstance(frequency, str):
-            try:
-                self.frequency = ScheduleFrequency(frequency.lower())
-            except ValueError:
-                raise ValueError(f"Unsupported frequency: {frequency}")
-        else:
-            self.frequency = frequency
-        
-        # Convert string status to Enum if necessary
-        if isinstance(status, str):
-            try:
-                self.status = ScheduleStatus(status.lower())
-            except ValueError:
-                raise ValueError(f"Invalid status: {status}")
-        else:
-            self.status = status
+        # Convert string frequency and status to Enums if necessary
+        self.frequency = _to_frequency(frequency)
+        self.status = _to_status(status)
         
         self.max_executions = max_executions
         self.max_retries = max_retries
@@ -133,15 +272,16 @@ class ScheduledItem(Base):
         if self.scheduled_time <= datetime.now():
             raise ValueError("Scheduled time must be in the future")
             
-        # Validate foreign key references if needed
+        # Validate foreign key references if needed. EXISTS probes answer
+        # without loading the referenced post.
         if validate_references:
             if self.blog_post_id:
                 from app.models.blog import BlogPost
-                if not BlogPost.get_by_id(self.blog_post_id):
+                if not db.session.scalar(select(exists().where(BlogPost.id == self.blog_post_id))):
                     raise ValueError(f"Blog post with ID {self.blog_post_id} not found")
             if self.social_post_id:
                 from app.models.social import SocialPost
-                if not SocialPost.get_by_id(self.social_post_id):
+                if not db.session.scalar(select(exists().where(SocialPost.id == self.social_post_id))):
                     raise ValueError(f"Social post with ID {self.social_post_id} not found")
 
         db.session.add(self)
@@ -150,21 +290,16 @@ class ScheduledItem(Base):
     
     def update(self, **kwargs) -> 'ScheduledItem':
         """Update scheduled item fields"""
-        # Special handling for frequency to ensure it's an enum
-        if 'frequency' in kwargs:
-            frequency = kwargs.pop('frequency')
-            if isinstance(frequency, str):
-                self.frequency = ScheduleFrequency(frequency.lower())
-            else:
-                self.frequency = frequency
+        # Same rule as save(), checked before anything is changed; the
+        # database CHECK would otherwise fail the commit with an IntegrityError
+        if 'scheduled_time' in kwargs and kwargs['scheduled_time'] <= datetime.now():
+            raise ValueError("Scheduled time must be in the future")
         
-        # Special handling for status to convert string to enum
+        # Special handling for frequency and status to convert strings to enums
+        if 'frequency' in kwargs:
+            self.frequency = _to_frequency(kwargs.pop('frequency'))
         if 'status' in kwargs:
-            status = kwargs.pop('status')
-            if isinstance(status, str):
-                self.status = ScheduleStatus(status.lower())
-            else:
-                self.status = status
+            self.status = _to_status(kwargs.pop('status'))
         
         # Update scheduled_time and next_execution together if needed
         if 'scheduled_time' in kwargs:
@@ -177,6 +312,10 @@ class ScheduledItem(Base):
             if hasattr(self, key):
                 setattr(self, key, value)
         
+        # Reopening a finished item needs a next_execution to become due again
+        if self.status == ScheduleStatus.PENDING and self.next_execution is None:
+            self.next_execution = self.scheduled_time
+        
         db.session.commit()
         return self
     
@@ -193,139 +332,90 @@ class ScheduledItem(Base):
         db.session.commit()
         return self
     
-    def mark_completed(self) -> 'ScheduledItem':
-        """Mark the scheduled item as completed"""
-        now = datetime.now()
+    def mark_completed(self, commit: bool = True, now: Optional[datetime] = None) -> 'ScheduledItem':
+        """
+        Mark the scheduled item as completed
+        
+        Args:
+            commit: Commit straight away (default True). Pass False to leave
+                    the change for the caller's commit, as execute_due does
+            now: The execution time (defaults to the current time)
+        """
+        now = now or datetime.now()
         self.last_executed_at = now
         self.execution_count += 1
         
-        # For recurring schedules, calculate the next execution time
-        if (self.frequency != ScheduleFrequency.ONCE and 
+        # Recurring schedules move on to their next occurrence until they
+        # reach max_executions
+        next_occurrence = _NEXT_OCCURRENCE.get(self.frequency)
+        if (next_occurrence is not None and 
             (self.max_executions is None or self.execution_count < self.max_executions)):
-            
-            from datetime import timedelta
-            
-            if self.frequency == ScheduleFrequency.DAILY:
-                # Calculate next execution based on original schedule plus execution count days
-                self.next_execution = self.scheduled_time + timedelta(days=self.execution_count)
-                # If next execution is in the past, adjust to future
-                if self.next_execution <= now:
-                    days_passed = (now - self.scheduled_time).days + 1
-                    self.next_execution = self.scheduled_time + timedelta(days=days_passed)
-                    
-            elif self.frequency == ScheduleFrequency.WEEKLY:
-                # Calculate next execution based on original schedule plus execution count weeks
-                self.next_execution = self.scheduled_time + timedelta(weeks=self.execution_count)
-                # If next execution is in the past, adjust to future
-                if self.next_execution <= now:
-                    weeks_passed = ((now - self.scheduled_time).days // 7) + 1
-                    self.next_execution = self.scheduled_time + timedelta(weeks=weeks_passed)
-                
-            elif self.frequency == ScheduleFrequency.MONTHLY:
-                # Calculate next month based on original month + execution count
-                next_month = self.scheduled_time.month + self.execution_count
-                next_year = self.scheduled_time.year + ((next_month - 1) // 12)
-                next_month = ((next_month - 1) % 12) + 1
-                
-                # Handle edge cases for days at the end of month
-                try:
-                    self.next_execution = self.scheduled_time.replace(year=next_year, month=next_month)
-                except ValueError:
-                    # If the day doesn't exist in the target month, use the last day
-                    if next_month == 2:
-                        # Handle February
-                        last_day = 29 if next_year % 4 == 0 and (next_year % 100 != 0 or next_year % 400 == 0) else 28
-                    elif next_month in [4, 6, 9, 11]:
-                        last_day = 30
-                    else:
-                        last_day = 31
-                    
-                    # Create a date with the last valid day of the month
-                    self.next_execution = self.scheduled_time.replace(
-                        year=next_year, 
-                        month=next_month,
-                        day=last_day
-                    )
-                
-                # If next execution is in the past, adjust to future
-                if self.next_execution <= now:
-                    additional_months = 1
-                    while True:
-                        future_month = next_month + additional_months
-                        future_year = next_year + ((future_month - 1) // 12)
-                        future_month = ((future_month - 1) % 12) + 1
-                        
-                        try:
-                            future_date = self.scheduled_time.replace(
-                                year=future_year,
-                                month=future_month
-                            )
-                        except ValueError:
-                            # Handle month end edge cases
-                            if future_month == 2:
-                                last_day = 29 if future_year % 4 == 0 and (future_year % 100 != 0 or future_year % 400 == 0) else 28
-                            elif future_month in [4, 6, 9, 11]:
-                                last_day = 30
-                            else:
-                                last_day = 31
-                            
-                            future_date = self.scheduled_time.replace(
-                                year=future_year,
-                                month=future_month,
-                                day=last_day
-                            )
-                            
-                        if future_date > now:
-                            self.next_execution = future_date
-                            break
-                        additional_months += 1
-            
+            self.next_execution = next_occurrence(self.scheduled_time, self.execution_count, now)
             self.status = ScheduleStatus.PENDING
         else:
             # This was the last execution
             self.status = ScheduleStatus.COMPLETED
             self.next_execution = None
         
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
     
-    def mark_failed(self, error: str = None) -> 'ScheduledItem':
-        """Mark the scheduled item as failed"""
-        self.last_executed_at = datetime.now()
+    def mark_failed(
+        self,
+        error: str = None,
+        commit: bool = True,
+        now: Optional[datetime] = None
+    ) -> 'ScheduledItem':
+        """
+        Mark the scheduled item as failed
+        
+        Args:
+            error: The failure message to record
+            commit: Commit straight away (default True), as for mark_completed
+            now: The execution time (defaults to the current time)
+        """
+        now = now or datetime.now()
+        self.last_executed_at = now
         self.retry_count += 1
         self.last_error = error or "Execution failed"
         
-        # Store error in metadata
-        if 'errors' not in self.schedule_metadata:
-            self.schedule_metadata['errors'] = []
-        self.schedule_metadata['errors'].append({
-            'time': datetime.now().isoformat(),
+        # Keep the most recent errors in metadata. Assigning a new list, rather
+        # than appending in place, is what marks the JSON column as changed,
+        # and the cap stops retried failures from growing the row without bound.
+        errors = self.schedule_metadata.get('errors', [])
+        self.schedule_metadata['errors'] = errors[-(_MAX_RECORDED_ERRORS - 1):] + [{
+            'time': now.isoformat(),
             'message': error or "Execution failed"
-        })
+        }]
         
         if self.retry_count < self.max_retries:
             # We can retry later
-            from datetime import timedelta
             # Exponential backoff for retries: 5min, 15min, 45min, etc.
-            backoff_minutes = 5 * (3 ** (self.retry_count - 1))
-            self.next_execution = datetime.now() + timedelta(minutes=backoff_minutes)
+            self.next_execution = now + _backoff(_FAILURE_BACKOFFS, 3, self.retry_count - 1)
             self.status = ScheduleStatus.PENDING
         else:
             # Max retries reached, mark as failed
             self.status = ScheduleStatus.FAILED
             self.next_execution = None
         
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
     
-    def execute(self) -> bool:
+    def execute(self, commit: bool = True, now: Optional[datetime] = None) -> bool:
         """
         Execute the scheduled item by publishing the associated post.
         
+        Args:
+            commit: Commit the outcome straight away (default True). Pass False
+                    when executing a batch that is committed once at the end
+            now: The current time, when the caller already has it for a batch
+        
         Returns:
             bool: True if execution was successful, False otherwise
         """
-        now = datetime.now()
+        now = now or datetime.now()
         execution_time = self.next_execution or self.scheduled_time
         
         # Skip if not pending or not due yet
@@ -333,29 +423,45 @@ class ScheduledItem(Base):
             return False
         
         try:
+            # Go through the relationships so posts loaded by
+            # get_due_items(eager=True) are not fetched again one by one
             if self.blog_post_id:
                 # Publish blog post
-                from app.models.blog import BlogPost
-                blog_post = BlogPost.get_by_id(self.blog_post_id)
-                if not blog_post:
+                if self.blog_post is None:
                     raise ValueError(f"Blog post with ID {self.blog_post_id} not found")
-                blog_post.publish()
+                self.blog_post.publish(commit=False)
                 
             elif self.social_post_id:
                 # Publish social post
-                from app.models.social import SocialPost
-                social_post = SocialPost.get_by_id(self.social_post_id)
-                if not social_post:
+                if self.social_post is None:
                     raise ValueError(f"Social post with ID {self.social_post_id} not found")
-                social_post.publish()
+                self.social_post.publish(commit=False)
             
-            self.mark_completed()
+            self.mark_completed(commit=commit, now=now)
             return True
             
         except Exception as e:
-            self.mark_failed(str(e))
+            self.mark_failed(str(e), commit=commit, now=now)
             return False
     
+    @classmethod
+    def execute_due(cls) -> int:
+        """
+        Execute every due item and commit the whole batch once.
+        
+        The whole batch shares one reading of the clock.
+        
+        Returns:
+            int: The number of items executed successfully
+        """
+        now = datetime.now()
+        executed = sum(
+            item.execute(commit=False, now=now)
+            for item in cls.get_due_items(eager=True, now=now)
+        )
+        db.session.commit()
+        return executed
+    
     @classmethod
     def get_by_id(cls, schedule_id: str) -> Optional['ScheduledItem']:
         """Get a scheduled item by ID"""
@@ -367,21 +473,37 @@ class ScheduledItem(Base):
         return db.session.query(cls).all()
     
     @classmethod
-    def get_pending(cls) -> List['ScheduledItem']:
-        """Get all pending scheduled items"""
-        return db.session.query(cls).filter_by(status=ScheduleStatus.PENDING).all()
+    def get_pending(cls, stream: bool = False) -> Union[List['ScheduledItem'], Iterator['ScheduledItem']]:
+        """
+        Get all pending scheduled items
+        
+        Args:
+            stream: Return an iterator that fetches rows in batches of
+                _STREAM_BATCH_SIZE instead of a fully loaded list
+        """
+        return _scalars(_SELECT_PENDING, {}, stream)
     
     @classmethod
-    def get_due_items(cls) -> List['ScheduledItem']:
-        """Get all pending items that are due for execution"""
-        now = datetime.now()
-        return db.session.query(cls).filter(
-            cls.status == ScheduleStatus.PENDING,
-            db.or_(
-                cls.next_execution <= now,
-                db.and_(cls.next_execution.is_(None), cls.scheduled_time <= now)
-            )
-        ).all()
+    def get_due_items(
+        cls,
+        eager: bool = False,
+        now: Optional[datetime] = None,
+        stream: bool = False
+    ) -> Union[List['ScheduledItem'], Iterator['ScheduledItem']]:
+        """
+        Get all pending items that are due for execution
+        
+        Args:
+            eager: Also load each item's blog or social post, in one IN query
+                   per relationship, for callers about to execute the items
+            now: The time to compare against (defaults to the current time)
+            stream: Return an iterator over batches of _STREAM_BATCH_SIZE rows,
+                so a large backlog is never held in memory all at once
+        """
+        stmt = _SELECT_DUE
+        if eager:
+            stmt = stmt.options(selectinload(cls.blog_post), selectinload(cls.social_post))
+        return _scalars(stmt, {'now': now or datetime.now()}, stream)
     
     @classmethod
     def get_by_blog_post(cls, blog_post_id: str) -> List['ScheduledItem']:
@@ -447,11 +569,16 @@ class ScheduledItem(Base):
         self.status = ScheduleStatus.PENDING
         
         # Set next execution time with backoff
-        from datetime import timedelta
-        # Retry with exponential backoff
-        backoff_minutes = 5 * (2 ** self.retry_count)
-        self.next_execution = datetime.now() + timedelta(minutes=backoff_minutes)
+        # Retry with exponential backoff: 5min, 10min, 20min, etc.
+        self.next_execution = datetime.now() + _backoff(_RETRY_BACKOFFS, 2, self.retry_count)
         
         db.session.commit()
         return self
 
+
+# Constant-shape statements for the scheduler's polling queries, built once so
+# each call only binds parameters and SQLAlchemy reuses the compiled form
+_SELECT_PENDING = select(ScheduledItem).where(
+    ScheduledItem.status == ScheduleStatus.PENDING
+)
+_SELECT_DUE = _SELECT_PENDING.where(ScheduledItem.next_execution <= bindparam('now'))
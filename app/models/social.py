@@ -1,11 +1,11 @@
-import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
-from sqlalchemy import String, Text, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import String, Text, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.extensions import db
-from app.database import Base, MutableJSONDict, MutableJSONList
+from app.database import Base, JSONType, new_id
 
 
 class Platform(Enum):
@@ -24,48 +24,73 @@ class PostStatus(Enum):
     FAILED = "failed"
 
 
+@dataclass(frozen=True, slots=True)
+class PlatformConstraints:
+    """Content limits a platform puts on a post"""
+    char_limit: int
+    media_count: int
+    media_allowed: bool = True
+    requires_media: bool = False
+
+
+# Members by value, so strings from forms and JSON resolve with a dict lookup
+# rather than a call through the Enum constructor
+_PLATFORM_BY_VALUE = {platform.value: platform for platform in Platform}
+_STATUS_BY_VALUE = {status.value: status for status in PostStatus}
+
+
+# Plain columns update() may assign; platform and status are coerced separately
+_SOCIAL_POST_UPDATABLE_FIELDS = frozenset((
+    'content', 'topic', 'scheduled_at', 'published_at', 'media_urls',
+    'hashtags', 'generation_metadata'
+))
+
+
+def _coerce_enum(value: Any, table: Dict[str, Enum], error: str) -> Any:
+    """Resolve an enum member from itself or from a case-insensitive value string
+
+    A ValueError reading "<error>: <value>" is raised for unknown strings.
+    """
+    if value.__class__ is not str:
+        return value
+    member = table.get(value.lower())
+    if member is None:
+        raise ValueError(f"{error}: {value}")
+    return member
+
+
 class SocialPost(Base):
     """Model for social media posts with platform-specific validation"""
     
     __tablename__ = 'social_posts'
+    __table_args__ = (
+        # Serves get_by_status (the scheduler polls SCHEDULED) through its
+        # leading column, and status + scheduled_at range scans in full
+        Index('ix_social_posts_status_scheduled_at', 'status', 'scheduled_at'),
+    )
     
     # Platform-specific constraints stored as class variable
     PLATFORM_CONSTRAINTS = {
-        Platform.TWITTER: {
-            "char_limit": 280,
-            "media_allowed": True,
-            "media_count": 4
-        },
-        Platform.FACEBOOK: {
-            "char_limit": 63206,  # Practical limit
-            "media_allowed": True,
-            "media_count": 10
-        },
-        Platform.INSTAGRAM: {
-            "char_limit": 2200,
-            "media_allowed": True,
-            "media_count": 10,
-            "requires_media": True
-        },
-        Platform.LINKEDIN: {
-            "char_limit": 3000,
-            "media_allowed": True,
-            "media_count": 9
-        }
+        Platform.TWITTER: PlatformConstraints(char_limit=280, media_count=4),
+        Platform.FACEBOOK: PlatformConstraints(char_limit=63206, media_count=10),  # Practical limit
+        Platform.INSTAGRAM: PlatformConstraints(char_limit=2200, media_count=10, requires_media=True),
+        Platform.LINKEDIN: PlatformConstraints(char_limit=3000, media_count=9),
     }
     
     # Model columns
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=new_id)
     content: Mapped[str] = mapped_column(Text, nullable=False)
-    platform: Mapped[Platform] = mapped_column(SQLEnum(Platform), nullable=False)
+    platform: Mapped[Platform] = mapped_column(SQLEnum(Platform), nullable=False, index=True)
     topic: Mapped[str] = mapped_column(String(100), nullable=False)
     status: Mapped[PostStatus] = mapped_column(SQLEnum(PostStatus), default=PostStatus.DRAFT)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-    media_urls: Mapped[List[str]] = mapped_column(MutableJSONList, default=list)
-    hashtags: Mapped[List[str]] = mapped_column(MutableJSONList, default=list)
-    generation_metadata: Mapped[Dict[str, Any]] = mapped_column(MutableJSONDict, default=dict)
+    # Plain JSON without mutation tracking: these values are replaced
+    # wholesale, never edited in place, so assign a new list/dict to change one
+    media_urls: Mapped[List[str]] = mapped_column(JSONType, default=list)
+    hashtags: Mapped[List[str]] = mapped_column(JSONType, default=list)
+    generation_metadata: Mapped[Dict[str, Any]] = mapped_column(JSONType, default=dict)
     
     # Relationship with scheduled items
     schedules = relationship("ScheduledItem", back_populates="social_post", cascade="all, delete-orphan")
@@ -100,25 +125,11 @@ class SocialPost(Base):
             hashtags: List of hashtags for the post
             generation_metadata: Additional metadata about the post generation
         """
-        self.id = post_id or str(uuid.uuid4())
-        
-        # Convert string platform to Enum if necessary
-        if isinstance(platform, str):
-            try:
-                self.platform = Platform(platform.lower())
-            except ValueError:
-                raise ValueError(f"Unsupported platform: {platform}")
-        else:
-            self.platform = platform
+        self.id = post_id or new_id()
         
-        # Convert string status to Enum if necessary
-        if isinstance(status, str):
-            try:
-                self.status = PostStatus(status.lower())
-            except ValueError:
-                raise ValueError(f"Invalid status: {status}")
-        else:
-            self.status = status
+        # Convert string platform and status to Enums if necessary
+        self.platform = _coerce_enum(platform, _PLATFORM_BY_VALUE, 'Unsupported platform')
+        self.status = _coerce_enum(status, _STATUS_BY_VALUE, 'Invalid status')
         
         self.content = content
         self.topic = topic
@@ -140,109 +151,161 @@ class SocialPost(Base):
         Raises:
             ValueError: If validation fails
         """
-        constraints = self.PLATFORM_CONSTRAINTS.get(self.platform)
+        platform = self.platform
+        constraints = self.PLATFORM_CONSTRAINTS.get(platform)
         if not constraints:
-            raise ValueError(f"Unsupported platform: {self.platform}")
+            raise ValueError(f"Unsupported platform: {platform}")
         
         # Check character limit
-        if len(self.content) > constraints["char_limit"]:
+        content_length = len(self.content)
+        if content_length > constraints.char_limit:
             raise ValueError(
-                f"Content exceeds character limit for {self.platform.value}. "
-                f"Maximum: {constraints['char_limit']}, Current: {len(self.content)}"
+                f"Content exceeds character limit for {platform.value}. "
+                f"Maximum: {constraints.char_limit}, Current: {content_length}"
             )
         
-        # Check media requirements
-        if constraints.get("requires_media", False) and not self.media_urls:
-            raise ValueError(f"{self.platform.value} requires at least one media attachment")
-        
-        # Check media count
-        if len(self.media_urls) > constraints.get("media_count", 0):
+        # Check media requirements and count
+        media_count = len(self.media_urls)
+        if constraints.requires_media and not media_count:
+            raise ValueError(f"{platform.value} requires at least one media attachment")
+        if media_count > constraints.media_count:
             raise ValueError(
-                f"Too many media attachments for {self.platform.value}. "
-                f"Maximum: {constraints['media_count']}, Current: {len(self.media_urls)}"
+                f"Too many media attachments for {platform.value}. "
+                f"Maximum: {constraints.media_count}, Current: {media_count}"
             )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert social post to dictionary for serialization"""
+        # Enums and timestamps are left as-is; the app's JSON provider writes
+        # them as their values and as ISO 8601
         return {
             'id': self.id,
             'content': self.content,
-            'platform': self.platform.value,
+            'platform': self.platform,
             'topic': self.topic,
-            'status': self.status.value,
-            'created_at': self.created_at.isoformat(),
-            'scheduled_at': self.scheduled_at.isoformat() if self.scheduled_at else None,
-            'published_at': self.published_at.isoformat() if self.published_at else None,
+            'status': self.status,
+            'created_at': self.created_at,
+            'scheduled_at': self.scheduled_at,
+            'published_at': self.published_at,
             'media_urls': self.media_urls,
             'hashtags': self.hashtags,
             'generation_metadata': self.generation_metadata
         }
     
-    def save(self) -> 'SocialPost':
-        """Save the social post to the database"""
+    def save(self, commit: bool = True) -> 'SocialPost':
+        """Save the social post to the database (commit=False only adds it to the session)"""
         db.session.add(self)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
     
-    def update(self, **kwargs) -> 'SocialPost':
-        """Update social post fields"""
-        # Special handling for platform to ensure validation
-        if 'platform' in kwargs:
-            platform = kwargs.pop('platform')
-            if isinstance(platform, str):
-                self.platform = Platform(platform.lower())
-            else:
-                self.platform = platform
+    @classmethod
+    def bulk_create(cls, records: List[Dict[str, Any]]) -> List['SocialPost']:
+        """
+        Create many social posts in one transaction.
+        
+        Every record is validated before anything is written, so one invalid
+        record leaves the database untouched.
+        
+        Args:
+            records: Dicts of SocialPost constructor arguments
+            
+        Returns:
+            The saved posts, in the order given
+            
+        Raises:
+            ValueError: Listing every invalid record by index, not just the first
+        """
+        posts = []
+        errors = []
+        for index, record in enumerate(records):
+            try:
+                posts.append(cls(**record))
+            except ValueError as e:
+                errors.append(f"record {index}: {e}")
+        if errors:
+            raise ValueError("Invalid social posts: " + "; ".join(errors))
         
-        # Special handling for status to convert string to enum
+        db.session.add_all(posts)
+        db.session.commit()
+        return posts
+    
+    def update(self, commit: bool = True, **kwargs) -> 'SocialPost':
+        """Update social post fields, committing unless commit=False"""
+        # Special handling for platform and status to convert strings to enums
+        if 'platform' in kwargs:
+            self.platform = _coerce_enum(kwargs.pop('platform'), _PLATFORM_BY_VALUE, 'Unsupported platform')
         if 'status' in kwargs:
-            status = kwargs.pop('status')
-            if isinstance(status, str):
-                self.status = PostStatus(status.lower())
-            else:
-                self.status = status
+            self.status = _coerce_enum(kwargs.pop('status'), _STATUS_BY_VALUE, 'Invalid status')
         
-        # Update other fields
+        # Update other fields; unknown keys, methods and properties are ignored
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key in _SOCIAL_POST_UPDATABLE_FIELDS:
                 setattr(self, key, value)
         
         # Re-validate after updates
         self.validate()
         
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
     
-    def delete(self) -> bool:
-        """Delete the social post from the database"""
+    def delete(self, commit: bool = True) -> bool:
+        """Delete the social post from the database, committing unless commit=False"""
         db.session.delete(self)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return True
     
-    def schedule(self, scheduled_at: datetime) -> 'SocialPost':
-        """Schedule the post for publishing"""
-        if scheduled_at <= datetime.now():
+    def schedule(
+        self,
+        scheduled_at: datetime,
+        commit: bool = True,
+        now: Optional[datetime] = None
+    ) -> 'SocialPost':
+        """Schedule the post for publishing, committing unless commit=False"""
+        if scheduled_at <= (now or datetime.now()):
             raise ValueError("Scheduled time must be in the future")
         
         self.scheduled_at = scheduled_at
         self.status = PostStatus.SCHEDULED
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return self
     
-    def publish(self) -> 'SocialPost':
-        """Mark the post as published"""
-        self.status = PostStatus.PUBLISHED
-        self.published_at = datetime.now()
+    @classmethod
+    def schedule_many(cls, posts: List['SocialPost'], scheduled_at: datetime) -> List['SocialPost']:
+        """Schedule several posts for the same time with one clock reading and one commit"""
+        now = datetime.now()
+        for post in posts:
+            post.schedule(scheduled_at, commit=False, now=now)
         db.session.commit()
+        return posts
+    
+    def publish(self, commit: bool = True, now: Optional[datetime] = None) -> 'SocialPost':
+        """Mark the post as published (at now, if given), committing unless commit=False"""
+        self.status = PostStatus.PUBLISHED
+        self.published_at = now or datetime.now()
+        if commit:
+            db.session.commit()
         return self
     
-    def mark_failed(self, reason: str = None) -> 'SocialPost':
-        """Mark the post as failed to publish"""
-        self.status = PostStatus.FAILED
-        if reason:
-            if 'failure_reason' not in self.generation_metadata:
-                self.generation_metadata['failure_reason'] = reason
+    @classmethod
+    def publish_many(cls, posts: List['SocialPost']) -> List['SocialPost']:
+        """Publish several posts with a shared timestamp and one commit"""
+        now = datetime.now()
+        for post in posts:
+            post.publish(commit=False, now=now)
         db.session.commit()
+        return posts
+    
+    def mark_failed(self, reason: str = None, commit: bool = True) -> 'SocialPost':
+        """Mark the post as failed to publish, committing unless commit=False"""
+        self.status = PostStatus.FAILED
+        if reason and 'failure_reason' not in self.generation_metadata:
+            self.generation_metadata = {**self.generation_metadata, 'failure_reason': reason}
+        if commit:
+            db.session.commit()
         return self
     
     @classmethod
@@ -258,22 +321,14 @@ class SocialPost(Base):
     @classmethod
     def get_by_status(cls, status: Union[PostStatus, str]) -> List['SocialPost']:
         """Get all posts with the given status"""
-        if isinstance(status, str):
-            status_enum = PostStatus(status.lower())
-        else:
-            status_enum = status
-            
-        return db.session.query(cls).filter_by(status=status_enum).all()
+        status = _coerce_enum(status, _STATUS_BY_VALUE, 'Invalid status')
+        return db.session.query(cls).filter_by(status=status).all()
     
     @classmethod
     def get_by_platform(cls, platform: Union[Platform, str]) -> List['SocialPost']:
         """Get all posts for the given platform"""
-        if isinstance(platform, str):
-            platform_enum = Platform(platform.lower())
-        else:
-            platform_enum = platform
-            
-        return db.session.query(cls).filter_by(platform=platform_enum).all()
+        platform = _coerce_enum(platform, _PLATFORM_BY_VALUE, 'Unsupported platform')
+        return db.session.query(cls).filter_by(platform=platform).all()
     
     @classmethod
     def get_scheduled_posts(cls) -> List['SocialPost']:
@@ -298,7 +353,8 @@ class SocialPost(Base):
     @property
     def character_limit(self) -> int:
         """Get the character limit for the platform"""
-        return self.PLATFORM_CONSTRAINTS.get(self.platform, {}).get("char_limit", 0)
+        constraints = self.PLATFORM_CONSTRAINTS.get(self.platform)
+        return constraints.char_limit if constraints else 0
     
     @property
     def characters_remaining(self) -> int:
@@ -43,44 +43,45 @@ def ensure_sample_data(start_date: datetime.date, end_date: datetime.date) -> No
     metrics_list = WebsiteMetrics.get_date_range(start_date, end_date)
     
     if not metrics_list:
+        # The whole range is empty, so generate every day and insert in one batch
+        rows = []
         current_date = start_date
         while current_date <= end_date:
-            # Check if metrics already exist for this date
-            existing = WebsiteMetrics.get_by_date(current_date)
-            if not existing:
-                # Generate random metrics for demonstration
-                day_factor = (current_date - start_date).days / max(1, (end_date - start_date).days)
-                base_impressions = 1000 + day_factor * 5000
-                base_clicks = base_impressions * (0.05 + day_factor * 0.1)
-                
-                impressions = int(base_impressions * (0.8 + 0.4 * ((current_date.weekday() % 7) / 7)))
-                clicks = int(base_clicks * (0.8 + 0.4 * ((current_date.weekday() % 7) / 7)))
-                visitors = int(clicks * (1.2 + 0.3 * ((current_date.weekday() % 7) / 7)))
-                unique_visitors = int(visitors * 0.7)
-                
-                # Create sample metrics
-                WebsiteMetrics(
-                    date=current_date,
-                    impressions=impressions,
-                    clicks=clicks,
-                    visitors=visitors,
-                    unique_visitors=unique_visitors,
-                    bounce_rate=30 + day_factor * 10,
-                    avg_session_duration=30 + int(day_factor * 60),
-                    unique_keywords=50 + int(day_factor * 100),
-                    top_keywords={
-                        'sample_keyword_1': {'impressions': int(impressions * 0.2), 'clicks': int(clicks * 0.2)},
-                        'sample_keyword_2': {'impressions': int(impressions * 0.15), 'clicks': int(clicks * 0.15)},
-                        'sample_keyword_3': {'impressions': int(impressions * 0.1), 'clicks': int(clicks * 0.1)}
-                    },
-                    top_pages={
-                        '/blog/sample-1': {'impressions': int(impressions * 0.25), 'clicks': int(clicks * 0.25)},
-                        '/blog/sample-2': {'impressions': int(impressions * 0.2), 'clicks': int(clicks * 0.2)},
-                        '/blog/sample-3': {'impressions': int(impressions * 0.15), 'clicks': int(clicks * 0.15)}
-                    }
-                ).save()
+            # Generate random metrics for demonstration
+            day_factor = (current_date - start_date).days / max(1, (end_date - start_date).days)
+            base_impressions = 1000 + day_factor * 5000
+            base_clicks = base_impressions * (0.05 + day_factor * 0.1)
+            
+            impressions = int(base_impressions * (0.8 + 0.4 * ((current_date.weekday() % 7) / 7)))
+            clicks = int(base_clicks * (0.8 + 0.4 * ((current_date.weekday() % 7) / 7)))
+            visitors = int(clicks * (1.2 + 0.3 * ((current_date.weekday() % 7) / 7)))
+            unique_visitors = int(visitors * 0.7)
+            
+            # Create sample metrics
+            rows.append(dict(
+                date=current_date,
+                impressions=impressions,
+                clicks=clicks,
+                visitors=visitors,
+                unique_visitors=unique_visitors,
+                bounce_rate=30 + day_factor * 10,
+                avg_session_duration=30 + int(day_factor * 60),
+                unique_keywords=50 + int(day_factor * 100),
+                top_keywords={
+                    'sample_keyword_1': {'impressions': int(impressions * 0.2), 'clicks': int(clicks * 0.2)},
+                    'sample_keyword_2': {'impressions': int(impressions * 0.15), 'clicks': int(clicks * 0.15)},
+                    'sample_keyword_3': {'impressions': int(impressions * 0.1), 'clicks': int(clicks * 0.1)}
+                },
+                top_pages={
+                    '/blog/sample-1': {'impressions': int(impressions * 0.25), 'clicks': int(clicks * 0.25)},
+                    '/blog/sample-2': {'impressions': int(impressions * 0.2), 'clicks': int(clicks * 0.2)},
+                    '/blog/sample-3': {'impressions': int(impressions * 0.15), 'clicks': int(clicks * 0.15)}
+                }
+            ))
             
             current_date += timedelta(days=1)
+        
+        WebsiteMetrics.bulk_insert(rows)
 
 # Helper function for getting period-based default days
 def get_default_days_from_period(period: str) -> int:
@@ -297,13 +298,13 @@ def get_top_keywords():
         # Get top keywords based on the requested metric
         if metric == 'position':
             # For position, lower is better
-            keywords = Keyword.query.order_by(Keyword.position.asc().nullslast()).limit(limit).all()
+            keywords = Keyword.list_query().order_by(Keyword.position.asc().nullslast()).limit(limit).all()
         elif metric == 'ctr':
-            keywords = Keyword.query.order_by(Keyword.ctr.desc().nullslast()).limit(limit).all()
+            keywords = Keyword.list_query().order_by(Keyword.ctr.desc().nullslast()).limit(limit).all()
         elif metric == 'impressions':
-            keywords = Keyword.query.order_by(Keyword.impressions.desc().nullslast()).limit(limit).all()
+            keywords = Keyword.list_query().order_by(Keyword.impressions.desc().nullslast()).limit(limit).all()
         else:  # clicks
-            keywords = Keyword.query.order_by(Keyword.clicks.desc().nullslast()).limit(limit).all()
+            keywords = Keyword.list_query().order_by(Keyword.clicks.desc().nullslast()).limit(limit).all()
         
         # If no keywords in database yet, return sample data
         if not keywords:
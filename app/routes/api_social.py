@@ -52,7 +52,7 @@ def api_social_generate():
         except ValueError:
             return jsonify({'success': False, 'error': f'Invalid platform: {platform}'}), 400
 
-        char_limit = SocialPost.PLATFORM_CONSTRAINTS[platform_enum]["char_limit"]
+        char_limit = SocialPost.PLATFORM_CONSTRAINTS[platform_enum].char_limit
 
         prompt = f"""Generate a {tone} social media post for {platform} about {topic}.
 Keep the post under {char_limit} characters.
@@ -79,7 +79,7 @@ def generate():
             return redirect(url_for('social.index'))
         
         # Get platform constraints for the prompt
-        char_limit = SocialPost.PLATFORM_CONSTRAINTS[platform_enum]["char_limit"]
+        char_limit = SocialPost.PLATFORM_CONSTRAINTS[platform_enum].char_limit
         
         # Create the prompt for the LM Studio API
         prompt = f"""Generate a {tone} social media post for {platform} about {topic}.
@@ -184,14 +184,14 @@ def preview(post_id):
         return redirect(url_for('social.index'))
     
     # Get platform constraints for display
-    constraints = SocialPost.PLATFORM_CONSTRAINTS.get(post.platform, {})
+    constraints = SocialPost.PLATFORM_CONSTRAINTS[post.platform]
     
     return render_template(
         'social/preview.html', 
         post=post, 
         constraints=constraints,
         char_count=len(post.content),
-        char_limit=constraints.get("char_limit", 0)
+        char_limit=constraints.char_limit
     )
 
 @bp.route('/edit/<post_id>', methods=['POST'])
@@ -4,6 +4,7 @@ import json
 import time
 from typing import Dict, List, Any, Optional, Union
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, ConnectionError
 from dotenv import load_dotenv
 
@@ -17,6 +18,12 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Shared session so every client reuses pooled connections to LM Studio.
+# Retries are handled by LMStudioClient._make_request, not by the adapter.
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 class LMStudioAPIError(Exception):
     """Custom exception for LM Studio API errors"""
     def __init__(self, message, status_code=None, response=None):
@@ -118,9 +125,9 @@ class LMStudioClient:
                 logger.debug(f"Making {method} request to {url}, attempt {retries + 1}/{self.max_retries + 1}")
                 
                 if method.upper() == 'GET':
-                    response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
+                    response = _session.get(url, params=params, headers=headers, timeout=self.timeout)
                 elif method.upper() == 'POST':
-                    response = requests.post(url, json=data, headers=headers, timeout=self.timeout)
+                    response = _session.post(url, json=data, headers=headers, timeout=self.timeout)
                 else:
                     raise ValueError(f"Unsupported HTTP method: {method}")
                 
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the database tests.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.database import db
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Record the SQL statements run against the engine.
+
+    Use as ``with count_queries() as statements:``; the list holds every
+    statement executed inside the block.
+    """
+    @contextmanager
+    def recorder():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+    return recorder
@@ -7,7 +7,7 @@ import json
 from datetime import datetime
 from flask import Flask
 from app import create_app
-from app.database import db
+from app.database import db, json_dumps
 from app.models.configuration import Configuration, ConfigValueType
 
 
@@ -18,12 +18,11 @@ def app():
     os.environ["FLASK_ENV"] = "testing"
     os.environ["TESTING"] = "True"
     
-    # Create the app with a test configuration
-    app = create_app()
-    app.config.update({
+    # Create the app with a test configuration; routes load on first request
+    app = create_app(test_config={
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-    })
+    }, lazy_blueprints=True)
     
     # Create the database tables
     with app.app_context():
@@ -133,6 +132,19 @@ class TestBasicConfigOperations:
         assert retrieved.value_type == ConfigValueType.BOOLEAN
         assert isinstance(retrieved.value, bool)
     
+    def test_set_value_boolean_round_trip(self, app_context):
+        """Test set_value(True) is stored as a boolean, not the integer 1"""
+        config = Configuration(key="test.flag", value="off")
+        config.set_value(True)
+        config.save()
+        db.session.expunge_all()
+        
+        retrieved = Configuration.get("test.flag")
+        assert retrieved.value_type == ConfigValueType.BOOLEAN
+        assert retrieved.value is True
+        assert Configuration.get_value("test.flag") is True
+        assert Configuration.get_by_prefix_dict("test")["test.flag"] is True
+    
     def test_create_json_config(self, app_context):
         """Test creating and retrieving a JSON configuration value"""
         # Create a config item with JSON value
@@ -233,6 +245,13 @@ class TestBasicConfigOperations:
         assert "group1.item2" in keys
         assert "group2.item1" not in keys
         assert "standalone" not in keys
+    
+    def test_json_dumps_rejects_datetime(self):
+        """Test json_dumps raises like the stdlib for values JSON can't hold"""
+        assert json.loads(json_dumps({"a": [1, "b"]})) == {"a": [1, "b"]}
+        
+        with pytest.raises(TypeError):
+            json_dumps({"when": datetime(2024, 1, 1)})
 
 
 class TestLMStudioConfiguration:
@@ -406,7 +425,6 @@ class TestSocialMediaConfiguration:
         assert "scam" in rules["facebook"]["disallowed_terms"]
 
 
-
 def test_configuration_set_group_method(app_context):
     """Test the set_group method for batch configuration setting"""
     # Define group data
@@ -514,7 +532,7 @@ def test_configuration_edge_cases(app_context):
     config.save()
     
     # Simulate SQLite storing as 1
-    config.value_bool = 1
+    config.value_data = 1
     db.session.commit()
     
     # Should still return as Python bool
@@ -523,7 +541,7 @@ def test_configuration_edge_cases(app_context):
     assert retrieved.value is True
     
     # Test with integer 0
-    config.value_bool = 0
+    config.value_data = 0
     db.session.commit()
     retrieved = Configuration.get("test.bool")
     assert isinstance(retrieved.value, bool)
@@ -540,6 +558,80 @@ def test_configuration_edge_cases(app_context):
     assert isinstance(Configuration.get_value("nonexistent.bool", default=True), bool)
 
 
+def test_configuration_writes_invalidate_cache(app_context):
+    """Test every write through the model is visible to the next cached read"""
+    Configuration.set("test.cached", "42")
+    assert Configuration.get_typed("test.cached", int) == 42
+    assert Configuration.get_all_dict() == {"test.cached": "42"}
+    
+    Configuration.set("test.cached", "43")
+    assert Configuration.get_typed("test.cached", int) == 43
+    assert Configuration.get_all_dict() == {"test.cached": "43"}
+    
+    Configuration.delete("test.cached")
+    assert Configuration.get_typed("test.cached", int, 0) == 0
+    assert Configuration.get_all_dict() == {}
+    
+    Configuration.set_group("test.group", {"a": 1})
+    assert Configuration.get_value("test.group.a") == 1
+    Configuration.delete_group("test.group")
+    assert Configuration.get_value("test.group.a") is None
+
+
+def test_cached_json_values_are_copied(app_context):
+    """Test callers mutating a JSON value do not change it for other callers"""
+    Configuration.set("test.json", {"tags": ["a"]})
+    Configuration.get_all_dict()
+    
+    Configuration.get_value("test.json")["tags"].append("b")
+    Configuration.get_all_dict()["test.json"]["tags"].append("c")
+    Configuration.get_typed("test.json", dict)["tags"].append("d")
+    
+    assert Configuration.get_value("test.json") == {"tags": ["a"]}
+    assert Configuration.get_group("test.") == {"json": {"tags": ["a"]}}
+
+
+def test_configuration_delete_group_method(app_context):
+    """Test delete_group removes only the keys under the prefix"""
+    Configuration.set_group("test.group", {"a": 1, "b": 2})
+    Configuration.set("other.key", "kept")
+    assert Configuration.get_by_prefix_dict("test.group.") == {"test.group.a": 1, "test.group.b": 2}
+    
+    assert Configuration.delete_group("test.group.") == 2
+    
+    assert Configuration.get_by_prefix("test.group.") == []
+    assert Configuration.get_by_prefix_dict("test.group.") == {}
+    assert Configuration.get("other.key").value == "kept"
+
+
+def test_get_group_decodes_plain_rows(app_context):
+    """Test get_group decodes every value type without loading Configuration objects"""
+    Configuration.set_group("test.rows", {
+        "name": "value",
+        "ratio": 0.5,
+        "options": {"nested": [1, 2]}
+    })
+    db.session.expunge_all()
+    
+    assert Configuration.get_group("test.rows") == {
+        "name": "value",
+        "ratio": 0.5,
+        "options": {"nested": [1, 2]}
+    }
+    assert len(db.session.identity_map) == 0
+
+
+def test_get_many_method(app_context):
+    """Test get_many fetches several keys at once and skips missing ones"""
+    Configuration.set("test.many.a", "first")
+    Configuration.set("test.many.b", 2)
+    
+    configs = Configuration.get_many(["test.many.a", "test.many.b", "test.many.missing"])
+    
+    assert set(configs) == {"test.many.a", "test.many.b"}
+    assert configs["test.many.a"].value == "first"
+    assert configs["test.many.b"].value == 2
+    assert Configuration.get_many([]) == {}
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
-
@@ -5,9 +5,12 @@ import os
 import pytest
 from datetime import datetime, timedelta
 from flask import Flask
+from sqlalchemy import event, update as sql_update
 from app import create_app
-from app.database import db
+from app.database import COPY_THRESHOLD, db
+from app.models.analytics import WebsiteMetrics
 from app.models.blog import BlogPost
+from app.models.keyword import Keyword, KeywordStatus
 from app.models.social import SocialPost, Platform, PostStatus
 from app.models.scheduling import ScheduledItem, ScheduleStatus, ScheduleFrequency
 
@@ -19,12 +22,11 @@ def app():
     os.environ["FLASK_ENV"] = "testing"
     os.environ["TESTING"] = "True"
     
-    # Create the app with a test configuration
-    app = create_app()
-    app.config.update({
+    # Create the app with a test configuration; routes load on first request
+    app = create_app(test_config={
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-    })
+    }, lazy_blueprints=True)
     
     # Create the database tables
     with app.app_context():
@@ -45,6 +47,26 @@ def app_context(app):
         yield
 
 
+@pytest.fixture(scope="function")
+def pg_app_context():
+    """Application context on the PostgreSQL database named by DATABASE_URL"""
+    database_url = os.environ.get("DATABASE_URL", "")
+    if not database_url.startswith("postgresql"):
+        pytest.skip("DATABASE_URL does not point at PostgreSQL")
+    
+    os.environ["FLASK_ENV"] = "testing"
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "SQLALCHEMY_ENGINE_OPTIONS": {},
+    })
+    with app.app_context():
+        db.create_all()
+        yield
+        db.session.remove()
+        db.drop_all()
+
+
 @pytest.fixture
 def future_datetime():
     """Return a datetime in the future for scheduling"""
@@ -76,6 +98,18 @@ class TestBlogPostModel:
         assert isinstance(blog_post.generation_metadata, dict)
         assert len(blog_post.generation_metadata) == 0
     
+    def test_blog_post_ids_are_time_ordered(self, app_context):
+        """Test generated ids are version 7 UUIDs that sort by creation time"""
+        import time
+        import uuid
+        
+        first = BlogPost(title="First", content="Content", topic="Testing")
+        time.sleep(0.002)
+        second = BlogPost(title="Second", content="Content", topic="Testing")
+        
+        assert uuid.UUID(first.id).version == 7
+        assert first.id < second.id
+    
     def test_blog_post_retrieval(self, app_context):
         """Test retrieving blog posts"""
         # Create multiple blog posts
@@ -117,6 +151,22 @@ class TestBlogPostModel:
         assert len(draft_posts) == 1
         assert draft_posts[0].id == post1.id
     
+    def test_blog_post_pagination(self, app_context):
+        """Test published/draft lists can be paginated newest first"""
+        import time
+        
+        titles = []
+        for i in range(3):
+            BlogPost(title=f"Draft {i}", content="Content", topic="Testing").save()
+            titles.append(f"Draft {i}")
+            time.sleep(0.002)
+        
+        first_page = BlogPost.get_drafts(limit=2)
+        second_page = BlogPost.get_drafts(limit=2, offset=2)
+        
+        assert [post.title for post in first_page + second_page] == list(reversed(titles))
+        assert BlogPost.get_published(limit=2) == []
+    
     def test_blog_post_update(self, app_context):
         """Test updating a blog post"""
         # Create a blog post
@@ -237,6 +287,274 @@ class TestBlogPostModel:
         assert len(updated_post.generation_metadata) == len(metadata) + 1
 
 
+class TestWebsiteMetricsModel:
+    """Test WebsiteMetrics queries and aggregations"""
+    
+    def test_aggregate_metrics(self, app_context):
+        """Test aggregates are summed and visitor-weighted over the range"""
+        WebsiteMetrics(date="2024-01-01", impressions=100, clicks=10, visitors=10,
+                       unique_visitors=8, bounce_rate=50.0, avg_session_duration=60,
+                       unique_keywords=5).save()
+        WebsiteMetrics(date="2024-01-02", impressions=300, clicks=30, visitors=30,
+                       unique_visitors=20, bounce_rate=30.0, avg_session_duration=120,
+                       unique_keywords=7).save()
+        # Outside the requested range
+        WebsiteMetrics(date="2024-01-05", impressions=1000, clicks=500, visitors=400).save()
+        
+        aggregate = WebsiteMetrics.get_aggregate_metrics("2024-01-01", "2024-01-02")
+        
+        assert aggregate['impressions'] == 400
+        assert aggregate['clicks'] == 40
+        assert aggregate['visitors'] == 40
+        assert aggregate['unique_visitors'] == 20
+        assert aggregate['unique_keywords'] == 7
+        assert aggregate['avg_bounce_rate'] == pytest.approx(35.0)
+        assert aggregate['avg_session_duration'] == pytest.approx(105.0)
+        assert aggregate['ctr'] == pytest.approx(10.0)
+        assert aggregate['date_range'] == {'start': '2024-01-01', 'end': '2024-01-02'}
+    
+    def test_aggregate_metrics_empty_range(self, app_context):
+        """Test an empty range aggregates to zeros"""
+        aggregate = WebsiteMetrics.get_aggregate_metrics("2024-01-01", "2024-01-31")
+        
+        assert aggregate['impressions'] == 0
+        assert aggregate['ctr'] == 0.0
+        assert aggregate['date_range'] == {'start': '2024-01-01', 'end': '2024-01-31'}
+    
+    def test_time_series_data(self, app_context):
+        """Test time series data is returned in date order"""
+        WebsiteMetrics(date="2024-03-02", impressions=20, clicks=2, visitors=3).save()
+        WebsiteMetrics(date="2024-03-01", impressions=10, clicks=1, visitors=2).save()
+        
+        series = WebsiteMetrics.get_time_series_data("2024-03-01", "2024-03-31")
+        
+        assert series == {
+            'labels': ['2024-03-01', '2024-03-02'],
+            'impressions': [10, 20],
+            'clicks': [1, 2],
+            'visitors': [2, 3]
+        }
+    
+    def test_bulk_insert(self, app_context):
+        """Test many days of metrics can be inserted in one batch"""
+        count = WebsiteMetrics.bulk_insert([
+            {'date': '2024-04-01', 'impressions': 10, 'top_keywords': {'seo': {'clicks': 1}}},
+            {'date': '2024-04-02', 'impressions': 20}
+        ])
+        
+        assert count == 2
+        first = WebsiteMetrics.get_by_date('2024-04-01')
+        assert len(first.id) == 36
+        assert first.top_keywords == {'seo': {'clicks': 1}}
+        assert WebsiteMetrics.get_by_date('2024-04-02').top_pages == {}
+        assert WebsiteMetrics.get_aggregate_metrics('2024-04-01', '2024-04-30')['impressions'] == 30
+    
+    def test_bulk_insert_copy_with_nulls(self, pg_app_context):
+        """Test COPY-sized batches on PostgreSQL store None as NULL"""
+        start = datetime(2024, 1, 1).date()
+        rows = [
+            {'date': start + timedelta(days=i), 'impressions': i, 'updated_at': None}
+            for i in range(COPY_THRESHOLD)
+        ]
+        rows[0]['top_pages'] = {'/a\tb': {'views': 1}}
+        rows[1]['updated_at'] = datetime(2024, 2, 1, 12, 0)
+        
+        count = WebsiteMetrics.bulk_insert(rows)
+        
+        assert count == COPY_THRESHOLD
+        first = WebsiteMetrics.get_by_date(start)
+        assert first.updated_at is None
+        assert first.created_at is not None
+        assert first.top_pages == {'/a\tb': {'views': 1}}
+        assert WebsiteMetrics.get_by_date(start + timedelta(days=1)).updated_at == datetime(2024, 2, 1, 12, 0)
+        assert WebsiteMetrics.get_aggregate_metrics(
+            start, start + timedelta(days=COPY_THRESHOLD - 1)
+        )['impressions'] == sum(range(COPY_THRESHOLD))
+    
+    def test_cache_sees_writes_outside_the_model(self, app_context):
+        """Test session and bulk statement writes clear cached aggregates"""
+        assert WebsiteMetrics.get_aggregate_metrics("2024-08-01", "2024-08-31")['impressions'] == 0
+        
+        db.session.add(WebsiteMetrics(date="2024-08-01", impressions=5))
+        db.session.commit()
+        assert WebsiteMetrics.get_aggregate_metrics("2024-08-01", "2024-08-31")['impressions'] == 5
+        
+        db.session.execute(
+            sql_update(WebsiteMetrics)
+            .where(WebsiteMetrics.date == datetime(2024, 8, 1).date())
+            .values(impressions=8)
+        )
+        db.session.commit()
+        assert WebsiteMetrics.get_time_series_data("2024-08-01", "2024-08-31")['impressions'] == [8]
+        assert WebsiteMetrics.get_aggregate_metrics("2024-08-01", "2024-08-31")['impressions'] == 8
+    
+    def test_cache_cleared_on_commit_not_flush(self, app_context):
+        """Test flushed writes only clear cached aggregates once committed"""
+        WebsiteMetrics(date="2024-10-01", impressions=5).save()
+        assert WebsiteMetrics.get_aggregate_metrics("2024-10-01", "2024-10-31")['impressions'] == 5
+        
+        db.session.add(WebsiteMetrics(date="2024-10-02", impressions=7))
+        db.session.flush()
+        assert WebsiteMetrics.get_aggregate_metrics("2024-10-01", "2024-10-31")['impressions'] == 5
+        
+        db.session.rollback()
+        db.session.add(WebsiteMetrics(date="2024-10-03", impressions=9))
+        db.session.commit()
+        assert WebsiteMetrics.get_aggregate_metrics("2024-10-01", "2024-10-31")['impressions'] == 14
+    
+    def test_calculate_trends(self, app_context):
+        """Test trends compare against the previous period of the same length"""
+        WebsiteMetrics(date="2024-05-01", impressions=100, clicks=10, visitors=10, bounce_rate=50.0).save()
+        WebsiteMetrics(date="2024-05-02", impressions=150, clicks=20, visitors=10, bounce_rate=40.0).save()
+        
+        trends = WebsiteMetrics.calculate_trends("2024-05-02", "2024-05-02")
+        
+        assert trends['impressions_trend'] == pytest.approx(50.0)
+        assert trends['clicks_trend'] == pytest.approx(100.0)
+        assert trends['visitors_trend'] == pytest.approx(0.0)
+        assert trends['bounce_rate_trend'] == pytest.approx(20.0)
+        assert trends['previous_period'] == {'start': '2024-05-01', 'end': '2024-05-01'}
+    
+    def test_update_ignores_unknown_fields(self, app_context):
+        """Test update writes allowed columns and skips everything else"""
+        metrics = WebsiteMetrics(date="2024-06-01", impressions=10).save()
+        original_id = metrics.id
+        
+        metrics.update(impressions=25, id="other-id", not_a_column=1)
+        
+        assert metrics.id == original_id
+        assert metrics.impressions == 25
+        assert metrics.updated_at is not None
+        assert WebsiteMetrics.get_aggregate_metrics("2024-06-01", "2024-06-01")['impressions'] == 25
+    
+    def test_date_range_streaming(self, app_context):
+        """Test streamed date ranges yield the same rows in date order"""
+        WebsiteMetrics(date="2024-07-02", impressions=2).save()
+        WebsiteMetrics(date="2024-07-01", impressions=1).save()
+        
+        streamed = WebsiteMetrics.get_date_range("2024-07-01", "2024-07-31", stream=True)
+        
+        assert not isinstance(streamed, list)
+        assert [m.impressions for m in streamed] == [1, 2]
+    
+    def test_date_range_serializes_without_lazy_loads(self, app_context, count_queries):
+        """Test serializing a date range never loads the breakdowns row by row"""
+        for day in range(1, 6):
+            WebsiteMetrics(date=f"2024-09-0{day}", top_pages={'/': {'views': day}}).save()
+        db.session.expunge_all()
+        
+        with count_queries() as statements:
+            summaries = [
+                m.to_dict(include_breakdowns=False)
+                for m in WebsiteMetrics.get_date_range("2024-09-01", "2024-09-30")
+            ]
+            full = [
+                m.to_dict()
+                for m in WebsiteMetrics.get_date_range("2024-09-01", "2024-09-30", breakdowns=True)
+            ]
+        
+        assert len(statements) == 2
+        assert all('top_pages' not in item for item in summaries)
+        assert [item['top_pages'] for item in full] == [{'/': {'views': day}} for day in range(1, 6)]
+    
+    def test_aggregate_cache_invalidated_on_save(self, app_context):
+        """Test cached aggregates are refreshed after metrics are written"""
+        WebsiteMetrics(date="2024-02-01", impressions=100, clicks=10, visitors=10).save()
+        assert WebsiteMetrics.get_aggregate_metrics("2024-02-01", "2024-02-29")['impressions'] == 100
+        
+        WebsiteMetrics(date="2024-02-02", impressions=50, clicks=5, visitors=5).save()
+        assert WebsiteMetrics.get_aggregate_metrics("2024-02-01", "2024-02-29")['impressions'] == 150
+
+
+class TestKeywordModel:
+    """Test Keyword model operations and behaviors"""
+    
+    def test_performance_data(self, app_context):
+        """Test performance totals and status counts are aggregated in SQL"""
+        first = Keyword(keyword="seo tools", status=KeywordStatus.ACTIVE.value).save()
+        first.update_metrics(impressions=1000, clicks=50)
+        second = Keyword(keyword="blog ideas", status=KeywordStatus.ACTIVE.value).save()
+        second.update_metrics(impressions=500, clicks=25)
+        Keyword(keyword="content plan").save()
+        
+        data = Keyword.get_performance_data()
+        
+        assert data['total_keywords'] == 3
+        assert data['total_impressions'] == 1500
+        assert data['total_clicks'] == 75
+        assert data['average_ctr'] == 5.0
+        assert data['keywords_by_status']['active'] == 2
+        assert data['keywords_by_status']['research'] == 1
+        assert data['keywords_by_status']['inactive'] == 0
+    
+    def test_update_metrics(self, app_context):
+        """Test metrics, CTR and position change are written together"""
+        keyword = Keyword(keyword="seo audit").save()
+        keyword.update_metrics(impressions=200, clicks=10, position=8.0)
+        keyword.update_metrics(impressions=400, clicks=30, position=5.0)
+        
+        db.session.expunge_all()
+        saved = Keyword.get_by_keyword("seo audit")
+        assert saved.impressions == 400
+        assert saved.clicks == 30
+        assert saved.ctr == 7.5
+        assert saved.position == 5.0
+        assert saved.position_change == 3.0
+    
+    def test_update_metrics_skips_unchanged_values(self, app_context):
+        """Test an update with the current values does not touch the row"""
+        keyword = Keyword(keyword="seo audit").save()
+        keyword.update_metrics(impressions=200, clicks=10, position=8.0)
+        updated_at = Keyword.get_by_keyword("seo audit").updated_at
+        
+        keyword.update_metrics(impressions=200, clicks=10)
+        
+        assert Keyword.get_by_keyword("seo audit").updated_at == updated_at
+    
+    def test_ctr_computed_by_database(self, app_context):
+        """Test the stored ctr on insert, after update_metrics and with no impressions"""
+        keyword = Keyword(keyword="seo audit")
+        keyword.impressions = 300
+        keyword.clicks = 7
+        keyword.save()
+        assert keyword.ctr == 2.33
+        
+        keyword.update_metrics(impressions=400, clicks=30)
+        assert keyword.ctr == 7.5
+        assert keyword.ctr == keyword.calculate_ctr()
+        
+        keyword.update_metrics(impressions=0, clicks=5)
+        assert keyword.ctr == 0
+        
+        empty = Keyword(keyword="new keyword").save()
+        assert empty.ctr == 0
+    
+    def test_update_metrics_before_save(self, app_context):
+        """Test metrics set on an unsaved keyword are kept and saved"""
+        keyword = Keyword(keyword="seo audit")
+        keyword.update_metrics(impressions=200, clicks=10, position=8.0)
+        
+        assert keyword.impressions == 200
+        assert keyword.clicks == 10
+        assert keyword.position == 8.0
+        assert keyword.calculate_ctr() == 5.0
+        
+        keyword.save()
+        db.session.expunge_all()
+        saved = Keyword.get_by_keyword("seo audit")
+        assert saved.impressions == 200
+        assert saved.clicks == 10
+        assert saved.ctr == 5.0
+    
+    def test_performance_data_empty(self, app_context):
+        """Test performance data with no keywords"""
+        data = Keyword.get_performance_data()
+        
+        assert data['total_keywords'] == 0
+        assert data['total_impressions'] == 0
+        assert data['average_ctr'] == 0
+
+
 class TestSocialPostModel:
     """Test SocialPost model operations and behaviors"""
     
@@ -375,6 +693,24 @@ class TestSocialPostModel:
         assert "failure_reason" in post.generation_metadata
         assert post.generation_metadata["failure_reason"] == "Test failure reason"
     
+    def test_publish_and_schedule_many(self, app_context):
+        """Test batch scheduling and publishing share one timestamp"""
+        posts = SocialPost.bulk_create([
+            {"content": f"Batch {i}", "platform": "twitter", "topic": "Batch"}
+            for i in range(3)
+        ])
+        
+        scheduled_at = datetime.now() + timedelta(days=1)
+        SocialPost.schedule_many(posts, scheduled_at)
+        assert all(post.is_scheduled and post.scheduled_at == scheduled_at for post in posts)
+        
+        with pytest.raises(ValueError):
+            SocialPost.schedule_many(posts, datetime.now() - timedelta(minutes=1))
+        
+        SocialPost.publish_many(posts)
+        assert all(post.is_published for post in posts)
+        assert len({post.published_at for post in posts}) == 1
+    
     def test_social_post_media_handling(self, app_context):
         """Test social post media handling"""
         # Create post with multiple media items
@@ -431,6 +767,17 @@ class TestSocialPostModel:
         assert "updated" in post.hashtags
         assert "testing" not in post.hashtags
     
+    def test_update_ignores_unknown_fields(self, app_context):
+        """Test update only assigns updatable columns"""
+        post = SocialPost(content="Original", platform="twitter", topic="Update").save()
+        original_id = post.id
+        
+        post.update(content="Edited", id="other-id", validate="not a method", not_a_column=1)
+        
+        assert post.id == original_id
+        assert post.content == "Edited"
+        assert callable(post.validate)
+    
     def test_social_post_retrieval(self, app_context):
         """Test retrieving social posts by various criteria"""
         # Create posts with different platforms and statuses
@@ -488,6 +835,39 @@ class TestSocialPostModel:
         assert len(published) == 1
         assert published[0].platform == Platform.FACEBOOK
     
+    def test_to_dict_serializes_enum_values(self, app):
+        """Test platform and status serialize as their plain values"""
+        import json
+        
+        with app.app_context():
+            post = SocialPost(content="Serialized", platform="linkedin", topic="JSON").save()
+            payload = json.loads(app.json.dumps(post.to_dict()))
+        
+        assert payload["platform"] == "linkedin"
+        assert payload["status"] == "draft"
+        assert payload["published_at"] is None
+    
+    def test_bulk_create(self, app_context):
+        """Test creating several posts in one transaction"""
+        posts = SocialPost.bulk_create([
+            {"content": f"Bulk post {i}", "platform": "twitter", "topic": "Bulk"}
+            for i in range(3)
+        ])
+        
+        assert [post.content for post in posts] == ["Bulk post 0", "Bulk post 1", "Bulk post 2"]
+        assert len(SocialPost.get_all()) == 3
+        
+        # Invalid records reject the whole batch and are all reported
+        with pytest.raises(ValueError) as excinfo:
+            SocialPost.bulk_create([
+                {"content": "Fine", "platform": "twitter", "topic": "Bulk"},
+                {"content": "x" * 281, "platform": "twitter", "topic": "Bulk"},
+                {"content": "No media", "platform": "instagram", "topic": "Bulk"},
+            ])
+        assert "record 1:" in str(excinfo.value)
+        assert "record 2:" in str(excinfo.value)
+        assert len(SocialPost.get_all()) == 3
+    
     def test_social_post_deletion(self, app_context):
         """Test deleting a social post"""
         # Create a social post
@@ -589,6 +969,44 @@ class TestScheduledItemModel:
             invalid_schedule.save()
         
         assert "Cannot schedule both a blog post and a social post" in str(excinfo.value)
+        
+        # Moving an existing schedule into the past is rejected up front
+        with pytest.raises(ValueError) as excinfo:
+            blog_schedule.update(scheduled_time=datetime.now() - timedelta(hours=1), max_retries=5)
+        
+        assert "must be in the future" in str(excinfo.value)
+        assert blog_schedule.scheduled_time == schedule_time
+        assert blog_schedule.next_execution == schedule_time
+        assert blog_schedule.max_retries != 5
+    
+    def test_database_rejects_past_schedule(self, app_context, future_datetime):
+        """Test raw inserts that skip the model still hit the future-time CHECK"""
+        from sqlalchemy import text
+        from sqlalchemy.exc import IntegrityError
+        
+        blog_post = BlogPost(title="Raw Insert", content="Content", topic="Scheduling").save()
+        insert_sql = text(
+            "INSERT INTO scheduled_items "
+            "(id, scheduled_time, frequency, status, execution_count, retry_count, max_retries, blog_post_id) "
+            "VALUES (:id, :scheduled_time, 'once', 'pending', 0, 0, 3, :post_id)"
+        )
+        
+        with pytest.raises(IntegrityError):
+            db.session.execute(insert_sql, {
+                'id': 'raw-past',
+                'scheduled_time': datetime.now() - timedelta(days=1),
+                'post_id': blog_post.id
+            })
+        db.session.rollback()
+        
+        # created_at comes from the server default, so future rows go in
+        db.session.execute(insert_sql, {
+            'id': 'raw-future',
+            'scheduled_time': future_datetime,
+            'post_id': blog_post.id
+        })
+        db.session.commit()
+        assert ScheduledItem.get_by_id('raw-future').created_at is not None
     
     def test_recurrence_patterns(self, app_context, future_datetime):
         """Test schedule recurrence patterns"""
@@ -732,7 +1150,36 @@ class TestScheduledItemModel:
         
         # Try to execute an already completed schedule
         assert blog_schedule.execute() is False
-    
+
+    def test_execute_due_batch(self, app_context, future_datetime):
+        """Test executing all due items with a single commit"""
+        posts = [
+            BlogPost(title=f"Batch Post {i}", content="Content", topic="Batch").save()
+            for i in range(3)
+        ]
+        schedules = [
+            ScheduledItem(scheduled_time=future_datetime, blog_post_id=post.id).save()
+            for post in posts
+        ]
+        not_due = ScheduledItem(scheduled_time=future_datetime, blog_post_id=posts[0].id).save()
+
+        for schedule in schedules:
+            schedule.next_execution = datetime.now() - timedelta(minutes=1)
+        db.session.commit()
+
+        session = db.session()
+        commits = []
+        event.listen(session, "after_commit", commits.append)
+        try:
+            assert ScheduledItem.execute_due() == 3
+        finally:
+            event.remove(session, "after_commit", commits.append)
+
+        assert len(commits) == 1
+        assert all(BlogPost.get_by_id(post.id).published for post in posts)
+        assert all(schedule.status == ScheduleStatus.COMPLETED for schedule in schedules)
+        assert not_due.status == ScheduleStatus.PENDING
+
     def test_error_handling_and_retries(self, app_context, future_datetime):
         """Test schedule error handling and retry logic"""
         # Create a valid blog post first
@@ -933,6 +1380,10 @@ class TestScheduledItemModel:
         assert schedule.is_pending is False
         assert schedule.next_execution is None
         
+        # Reopening a cancelled schedule restores its next execution
+        schedule.update(status='pending')
+        assert schedule.next_execution == schedule.scheduled_time
+        
         # Test status property methods
         pending_schedule = ScheduledItem(
             scheduled_time=future_datetime,
@@ -953,7 +1404,35 @@ class TestScheduledItemModel:
         pending_schedule.frequency = ScheduleFrequency.WEEKLY
         db.session.commit()
         assert pending_schedule.is_recurring is True
-    
+
+    def test_status_and_frequency_stored_as_values(self, app_context, future_datetime):
+        """Test status and frequency persist as plain strings but read back as enums"""
+        from sqlalchemy import text
+
+        blog_post = BlogPost(title="Stored Values", content="Content", topic="Scheduling")
+        blog_post.save()
+
+        schedule = ScheduledItem(
+            scheduled_time=future_datetime,
+            blog_post_id=blog_post.id,
+            frequency="Weekly"
+        )
+        schedule.save()
+
+        row = db.session.execute(text("SELECT status, frequency FROM scheduled_items")).one()
+        assert tuple(row) == ("pending", "weekly")
+
+        db.session.expire(schedule)
+        assert schedule.status is ScheduleStatus.PENDING
+        assert schedule.frequency is ScheduleFrequency.WEEKLY
+
+        # Class-level comparisons bind members and their string forms alike
+        assert db.session.query(ScheduledItem).filter(
+            ScheduledItem.status == ScheduleStatus.PENDING
+        ).all() == [schedule]
+        assert db.session.query(ScheduledItem).filter_by(frequency="WEEKLY").all() == [schedule]
+        assert db.session.query(ScheduledItem).filter_by(status=ScheduleStatus.COMPLETED).all() == []
+
     def test_schedule_retrieval_methods(self, app_context, future_datetime):
         """Test methods for retrieving scheduled items"""
         # Create a blog post and social post
@@ -1025,6 +1504,10 @@ class TestScheduledItemModel:
         assert len(due_items) == 1
         assert due_items[0].id == pending_blog_schedule.id
         
+        # Streaming variants yield the same rows
+        assert [item.id for item in ScheduledItem.get_due_items(stream=True)] == [pending_blog_schedule.id]
+        assert len(list(ScheduledItem.get_pending(stream=True))) == 2
+        
         # Test get_by_blog_post
         blog_schedules = ScheduledItem.get_by_blog_post(blog_post.id)
         assert len(blog_schedules) == 2
@@ -1152,6 +1635,25 @@ class TestScheduledItemModel:
         assert len(schedule.schedule_metadata["errors"]) == 1
         assert "Test failure" in schedule.schedule_metadata["errors"][0]["message"]
 
+    def test_recorded_errors_are_capped(self, app_context, future_datetime):
+        """Test repeated failures persist only the most recent errors"""
+        blog_post = BlogPost(title="Flaky Post", content="Content", topic="Errors")
+        blog_post.save()
+
+        schedule = ScheduledItem(
+            scheduled_time=future_datetime,
+            blog_post_id=blog_post.id,
+            max_retries=20
+        )
+        schedule.save()
+
+        for attempt in range(12):
+            schedule.mark_failed(f"Failure {attempt}")
+
+        db.session.expire(schedule)
+        messages = [entry["message"] for entry in schedule.schedule_metadata["errors"]]
+        assert messages == [f"Failure {attempt}" for attempt in range(2, 12)]
+
     def test_monthly_schedule_edge_cases(self, app_context):
         """Test edge cases in monthly schedule recurrence"""
         from datetime import datetime, timedelta
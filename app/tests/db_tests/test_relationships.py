@@ -7,7 +7,9 @@ from datetime import datetime, timedelta
 from flask import Flask
 from app import create_app
 from app.database import db
-from app.models.blog import BlogPost
+from sqlalchemy import inspect
+from app.models.blog import BlogPost, BlogPostSection
+from app.models.keyword import Keyword
 from app.models.social import SocialPost, Platform, PostStatus
 from app.models.scheduling import ScheduledItem, ScheduleStatus, ScheduleFrequency
 
@@ -19,12 +21,11 @@ def app():
     os.environ["FLASK_ENV"] = "testing"
     os.environ["TESTING"] = "True"
     
-    # Create the app with a test configuration
-    app = create_app()
-    app.config.update({
+    # Create the app with a test configuration; routes load on first request
+    app = create_app(test_config={
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-    })
+    }, lazy_blueprints=True)
     
     # Create the database tables
     with app.app_context():
@@ -97,6 +98,36 @@ class TestBlogPostRelationships:
         assert blog_post.schedules[0].id == schedule.id
         assert blog_post.schedules[0].blog_post_id == blog_post.id
     
+    def test_eager_loading_of_content_relationships(self, app_context, sample_blog_post):
+        """Test eager list queries load sections, versions and SEO data up front"""
+        db.session.add(BlogPostSection(post_id=sample_blog_post.id, order=0, content="Intro"))
+        db.session.commit()
+        db.session.expunge_all()
+        
+        lazy_post = BlogPost.get_all()[0]
+        assert {'sections', 'versions', 'seo_data'} <= inspect(lazy_post).unloaded
+        db.session.expunge_all()
+        
+        eager_post = BlogPost.get_all(eager=True)[0]
+        assert not {'sections', 'versions', 'seo_data'} & inspect(eager_post).unloaded
+        assert [section.content for section in eager_post.sections] == ["Intro"]
+    
+    def test_create_with_sections(self, app_context):
+        """Test a post and its sections are saved together"""
+        post = BlogPost.create_with_sections(
+            BlogPost(title="Sectioned Post", content="Body", topic="Testing"),
+            [
+                {'content': "Introduction", 'section_type': "header"},
+                {'content': "Details", 'title': "More"}
+            ]
+        )
+        
+        saved = BlogPost.get_by_id(post.id)
+        assert [section.content for section in saved.sections] == ["Introduction", "Details"]
+        assert [section.order for section in saved.sections] == [0, 1]
+        assert saved.sections[0].section_type == "header"
+        assert saved.sections[1].section_metadata == {}
+    
     def test_schedule_to_blog_back_reference(self, app_context, sample_blog_post, future_datetime):
         """Test accessing blog post from schedule"""
         # Create a schedule for the blog post
@@ -148,6 +179,45 @@ class TestBlogPostRelationships:
         assert ScheduledItem.get_by_id(schedule2.id) is None
 
 
+class TestKeywordRelationships:
+    """Tests for relationships between Keyword and BlogPost models"""
+    
+    def test_eager_list_serializes_without_lazy_loads(self, app_context, sample_blog_post, count_queries):
+        """Test serializing an eager keyword list takes one SELECT plus one IN query"""
+        post_id = sample_blog_post.id
+        for i in range(100):
+            keyword = Keyword(keyword=f"keyword {i}")
+            keyword.blog_posts.append(sample_blog_post)
+            db.session.add(keyword)
+        db.session.commit()
+        db.session.expunge_all()
+        
+        with count_queries() as statements:
+            keywords = Keyword.get_all(eager=True)
+            payload = [
+                dict(k.to_dict(), blogs=[post.id for post in k.blog_posts])
+                for k in keywords
+            ]
+        
+        assert len(payload) == 100
+        assert all(item['blogsCount'] == 1 for item in payload)
+        assert all(item['blogs'] == [post_id] for item in payload)
+        assert len(statements) <= 2
+    
+    def test_add_and_remove_blog_post(self, app_context, sample_blog_post):
+        """Test linking a blog post is idempotent and unlinking removes it"""
+        keyword = Keyword(keyword="linked keyword").save()
+        
+        keyword.add_blog_post(sample_blog_post)
+        keyword.add_blog_post(sample_blog_post)
+        assert [post.id for post in keyword.blog_posts] == [sample_blog_post.id]
+        assert keyword.blog_posts_count == 1
+        
+        keyword.remove_blog_post(sample_blog_post)
+        assert keyword.blog_posts == []
+        assert keyword.blog_posts_count == 0
+
+
 class TestSocialPostRelationships:
     """Test relationships between SocialPost and ScheduledItem"""
     
@@ -319,6 +389,26 @@ class TestComplexRelationshipScenarios:
         assert social_schedule.social_post_id == sample_social_post.id
         assert social_schedule.blog_post_id is None
     
+    def test_due_items_eager_load_posts(self, app_context, sample_social_post, future_datetime, count_queries):
+        """Test due items loaded eagerly reach their posts without further queries"""
+        for i in range(5):
+            post = BlogPost(title=f"Due Post {i}", content="Content", topic="Scheduling").save()
+            ScheduledItem(scheduled_time=future_datetime, blog_post_id=post.id).save()
+        ScheduledItem(scheduled_time=future_datetime, social_post_id=sample_social_post.id).save()
+        
+        db.session.query(ScheduledItem).update({'next_execution': datetime.now() - timedelta(minutes=1)})
+        db.session.commit()
+        db.session.expunge_all()
+        
+        due_items = ScheduledItem.get_due_items(eager=True)
+        
+        with count_queries() as statements:
+            posts = [item.blog_post or item.social_post for item in due_items]
+        
+        assert len(due_items) == 6
+        assert all(post is not None for post in posts)
+        assert statements == []
+    
     def test_relationship_constraints(self, app_context, sample_blog_post, future_datetime):
         """Test constraints on relationships"""
         # Create a schedule for the blog post
@@ -353,7 +353,7 @@ class TestBlogRoutes:
 
 # Integration Tests
 class TestLMStudioIntegration:
-    @patch('app.services.lmstudio.requests.get')
+    @patch('app.services.lmstudio._session.get')
     def test_lm_studio_models_endpoint(self, mock_get, app):
         """Test integration with LM Studio models endpoint."""
         # Mock response for the models endpoint
@@ -401,7 +401,7 @@ class TestLMStudioIntegration:
         assert models[0]['id'] == 'model1'
         assert models[1]['id'] == 'model2'
     
-    @patch('app.services.lmstudio.requests.post')
+    @patch('app.services.lmstudio._session.post')
     def test_chat_completion_generation(self, mock_post, app):
         """Test chat completion generation."""
         # Mock response for the chat completions endpoint
@@ -457,7 +457,7 @@ class TestLMStudioIntegration:
         # Verify the response was processed correctly
         assert response['choices'][0]['message']['content'] == "This is a test response from the assistant."
     
-    @patch('app.services.lmstudio.requests.post')
+    @patch('app.services.lmstudio._session.post')
     @patch('app.services.lmstudio.time.sleep')  # Mock sleep to avoid waiting during tests
     def test_error_handling_and_retries(self, mock_sleep, mock_post, app):
         """Test error handling and retry logic."""
@@ -516,7 +516,7 @@ class TestLMStudioIntegration:
         # Verify the response from the successful attempt
         assert response['choices'][0]['message']['content'] == "Success after retries!"
     
-    @patch('app.services.lmstudio.requests.post')
+    @patch('app.services.lmstudio._session.post')
     @patch('app.services.lmstudio.time.sleep')
     def test_max_retries_exceeded(self, mock_sleep, mock_post, app):
         """Test when max retries are exceeded."""
@@ -548,7 +548,7 @@ class TestLMStudioIntegration:
         assert "after 3 attempts" in str(excinfo.value)
         assert "Request timed out" in str(excinfo.value)
     
-    @patch('app.services.lmstudio.requests.post')
+    @patch('app.services.lmstudio._session.post')
     def test_api_error_response(self, mock_post, app):
         """Test handling of API error responses."""
         # Create a mock response with a 400 error
@@ -581,7 +581,7 @@ class TestLMStudioIntegration:
         assert "API error" in str(excinfo.value)
         assert "Invalid request parameters" in str(excinfo.value)
     
-    @patch('app.services.lmstudio.requests.get')
+    @patch('app.services.lmstudio._session.get')
     def test_connection_status_checking(self, mock_get, app):
         """Test checking connection status to LM Studio API."""
         # Set up mock for successful connection
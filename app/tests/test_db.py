@@ -3,7 +3,8 @@ from app import create_app
 from app.extensions import db
 from sqlalchemy import text
 
-app = create_app()
+# TESTING makes create_app initialise the database before returning
+app = create_app({'TESTING': True})
 with app.app_context():
     try:
         # Test raw connection
@@ -0,0 +1,180 @@
+import pytest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import patch, MagicMock
+
+import app as app_module
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    """Create and configure a Flask app for testing."""
+    app = create_app({
+        'TESTING': True,
+        'SECRET_KEY': 'test_key',
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+    })
+
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    """Test client for our Flask app."""
+    return app.test_client()
+
+
+@pytest.fixture
+def mock_get(app):
+    """Mock the pooled LM Studio session used by the health check."""
+    with patch.object(app.extensions['lm_studio_session'], 'get') as mock_get:
+        yield mock_get
+
+
+def _models_response():
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"data": [{"id": "test-model"}]}
+    return response
+
+
+class TestHealthEndpoint:
+    def test_health_reports_components(self, mock_get, client):
+        """Test the health endpoint reports database and LM Studio status."""
+        mock_get.return_value = _models_response()
+
+        response = client.get('/health')
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data['status'] == 'ok'
+        assert data['components']['database'] == 'ok'
+        assert data['components']['lm_studio'] == 'ok'
+        assert data['lm_studio_models'] == ['test-model']
+
+    def test_health_is_cached_within_ttl(self, mock_get, client):
+        """Test repeated health probes within the TTL reuse the cached result."""
+        mock_get.return_value = _models_response()
+
+        client.get('/health')
+        client.get('/health')
+        client.get('/health')
+
+        assert mock_get.call_count == 1
+
+    def test_health_refreshes_after_ttl(self, mock_get, app, client):
+        """Test the health checks run again once the cached result expires."""
+        mock_get.return_value = _models_response()
+
+        client.get('/health')
+        app.extensions['health_cache']["expires"] = 0.0
+        client.get('/health')
+
+        assert mock_get.call_count == 2
+
+
+    def test_health_reports_timed_out_check(self, mock_get, client):
+        """Test a check past the deadline is reported as a JSON timeout, not a 500."""
+        mock_get.return_value = _models_response()
+        submit = app_module._HEALTH_EXECUTOR.submit
+
+        def submit_with_hung_lm_studio(fn, *args, **kwargs):
+            if fn.__name__ == 'check_lm_studio':
+                hung = MagicMock()
+                hung.result.side_effect = FutureTimeoutError()
+                return hung
+            return submit(fn, *args, **kwargs)
+
+        with patch.object(app_module._HEALTH_EXECUTOR, 'submit', side_effect=submit_with_hung_lm_studio):
+            response = client.get('/health')
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data['status'] == 'degraded'
+        assert data['components']['database'] == 'ok'
+        assert data['components']['lm_studio'] == 'timeout'
+        assert 'stale' not in data
+
+    def test_health_serves_last_good_on_timeout(self, mock_get, app, client):
+        """Test a timed-out check falls back to the last known-good result."""
+        mock_get.return_value = _models_response()
+        client.get('/health')
+        app.extensions['health_cache']["expires"] = 0.0
+
+        hung = MagicMock()
+        hung.result.side_effect = FutureTimeoutError()
+        with patch.object(app_module._HEALTH_EXECUTOR, 'submit', return_value=hung):
+            data = client.get('/health').get_json()
+
+        assert data['status'] == 'ok'
+        assert data['stale'] is True
+
+
+    def test_health_serves_last_good_on_failure(self, mock_get, app, client):
+        """Test a failing check falls back to the last known-good result."""
+        mock_get.return_value = _models_response()
+        client.get('/health')
+        app.extensions['health_cache']["expires"] = 0.0
+
+        mock_get.side_effect = ConnectionError("LM Studio is down")
+        data = client.get('/health').get_json()
+
+        assert data['status'] == 'ok'
+        assert data['stale'] is True
+
+    def test_health_cache_is_per_app(self, mock_get, app, client):
+        """Test a new app does not see another app's cached health result."""
+        mock_get.return_value = _models_response()
+        client.get('/health')
+
+        other = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+
+        assert app.extensions['health_cache']["data"] is not None
+        assert other.extensions['health_cache']["data"] is None
+
+
+class TestHealthzEndpoint:
+    def test_healthz_performs_no_checks(self, mock_get, client):
+        """Test the liveness probe returns a static payload without any I/O."""
+        response = client.get('/healthz')
+
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "ok"}
+        mock_get.assert_not_called()
+
+
+class TestCorsHeaders:
+    def test_wildcard_origin_header(self, client):
+        """Test responses allow any origin by default."""
+        response = client.get('/healthz', headers={'Origin': 'http://example.com'})
+
+        assert response.headers['Access-Control-Allow-Origin'] == '*'
+
+    def test_preflight_headers(self, client):
+        """Test preflight requests receive the allowed methods and headers."""
+        response = client.options('/healthz', headers={
+            'Origin': 'http://example.com',
+            'Access-Control-Request-Method': 'POST',
+            'Access-Control-Request-Headers': 'Content-Type'
+        })
+
+        assert response.headers['Access-Control-Allow-Origin'] == '*'
+        assert 'POST' in response.headers['Access-Control-Allow-Methods']
+        assert response.headers['Access-Control-Allow-Headers'] == 'Content-Type'
+
+
+class TestDatabaseStartup:
+    def test_testing_app_is_ready_after_create(self, app):
+        """Test the database is initialised synchronously for testing apps."""
+        assert app.config['_DB_READY'] is True
+
+    def test_health_reports_starting_before_probe_succeeds(self, mock_get, app, client):
+        """Test /health trusts the startup flag instead of querying during the grace period."""
+        mock_get.return_value = _models_response()
+        app.config['_DB_READY'] = False
+
+        data = client.get('/health').get_json()
+
+        assert data['status'] == 'degraded'
+        assert data['components']['database'] == 'starting'
@@ -39,6 +39,11 @@ def get_engine_url():
 config.set_main_option('sqlalchemy.url', get_engine_url())
 target_db = current_app.extensions['migrate'].db
 
+# create_app imports the models along with the blueprints, but an app built
+# with lazy_blueprints=True defers that to the first request; import them here
+# so autogenerate always compares every table against the database
+import app.models  # noqa: E402,F401
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
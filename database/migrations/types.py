@@ -2,7 +2,7 @@
 Shared SQLAlchemy type definitions for use in migrations
 """
 import json
-from sqlalchemy.dialects.postgresql import JSON as PostgresJSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import JSON, TypeDecorator
 
 # Custom JSON type handling for SQLite/PostgreSQL compatibility
@@ -11,13 +11,13 @@ class JSONType(TypeDecorator):
     Custom JSON type that handles both SQLite and PostgreSQL databases.
     
     In SQLite, JSON is stored as a string and needs to be deserialized.
-    In PostgreSQL, the native JSON type is used.
+    In PostgreSQL, the binary JSONB type is used.
     """
     impl = JSON
     
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
-            return dialect.type_descriptor(PostgresJSON())
+            return dialect.type_descriptor(JSONB())
         else:
             return dialect.type_descriptor(JSON())
     
@@ -0,0 +1,52 @@
+"""add a LIKE-prefix index on configurations.key for postgresql
+
+Revision ID: configuration_key_pattern_index
+Revises: created_at_server_default
+Create Date: 2025-05-09 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'configuration_key_pattern_index'
+down_revision = 'created_at_server_default'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_configurations_key_pattern'
+
+
+def _index_names(inspector):
+    return [index['name'] for index in inspector.get_indexes('configurations')]
+
+
+def upgrade():
+    connection = op.get_bind()
+    # SQLite's case-insensitive LIKE cannot use an index, so this is PostgreSQL-only
+    if connection.dialect.name != 'postgresql':
+        return
+
+    inspector = reflection.Inspector.from_engine(connection)
+    if 'configurations' not in inspector.get_table_names():
+        return
+
+    if INDEX_NAME not in _index_names(inspector):
+        op.create_index(
+            INDEX_NAME, 'configurations', ['key'],
+            postgresql_ops={'key': 'varchar_pattern_ops'}
+        )
+
+
+def downgrade():
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+
+    inspector = reflection.Inspector.from_engine(connection)
+    if 'configurations' not in inspector.get_table_names():
+        return
+
+    if INDEX_NAME in _index_names(inspector):
+        op.drop_index(INDEX_NAME, table_name='configurations')
@@ -0,0 +1,99 @@
+"""store each configuration value in a single JSON column
+
+Revision ID: configuration_value_data
+Revises: keyword_trigram_index
+Create Date: 2025-05-13 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+from migrations.types import JSONType
+
+
+# revision identifiers, used by Alembic.
+revision = 'configuration_value_data'
+down_revision = 'keyword_trigram_index'
+branch_labels = None
+depends_on = None
+
+# Old per-type value column for each value_type (stored as the enum name)
+TYPED_COLUMNS = {
+    'STRING': 'value_string',
+    'INTEGER': 'value_int',
+    'FLOAT': 'value_float',
+    'BOOLEAN': 'value_bool',
+    'JSON': 'value_json',
+}
+
+configurations = sa.table(
+    'configurations',
+    sa.column('key', sa.String),
+    sa.column('value_type', sa.String),
+    sa.column('value_string', sa.Text),
+    sa.column('value_int', sa.Integer),
+    sa.column('value_float', sa.Float),
+    sa.column('value_bool', sa.Boolean),
+    sa.column('value_json', JSONType),
+    sa.column('value_data', JSONType),
+)
+
+
+def _configuration_columns():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'configurations' not in inspector.get_table_names():
+        return None
+    return [col['name'] for col in inspector.get_columns('configurations')]
+
+
+def upgrade():
+    columns = _configuration_columns()
+    if columns is None or 'value_data' in columns:
+        return
+
+    connection = op.get_bind()
+    with op.batch_alter_table('configurations') as batch_op:
+        batch_op.add_column(sa.Column('value_data', JSONType(), nullable=True))
+
+    # Configuration tables are small, so copy row by row in Python rather than
+    # writing per-dialect JSON conversions in SQL
+    rows = connection.execute(sa.select(configurations)).all()
+    for row in rows:
+        column = TYPED_COLUMNS.get(row.value_type, 'value_string')
+        connection.execute(
+            configurations.update()
+            .where(configurations.c.key == row.key)
+            .values(value_data=getattr(row, column))
+        )
+
+    with op.batch_alter_table('configurations') as batch_op:
+        for column in TYPED_COLUMNS.values():
+            batch_op.drop_column(column)
+
+
+def downgrade():
+    columns = _configuration_columns()
+    if columns is None or 'value_data' not in columns:
+        return
+
+    connection = op.get_bind()
+    with op.batch_alter_table('configurations') as batch_op:
+        batch_op.add_column(sa.Column('value_string', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('value_int', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('value_float', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('value_bool', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('value_json', JSONType(), nullable=True))
+
+    rows = connection.execute(
+        sa.select(configurations.c.key, configurations.c.value_type, configurations.c.value_data)
+    ).all()
+    for row in rows:
+        column = TYPED_COLUMNS.get(row.value_type, 'value_string')
+        connection.execute(
+            configurations.update()
+            .where(configurations.c.key == row.key)
+            .values({column: row.value_data})
+        )
+
+    with op.batch_alter_table('configurations') as batch_op:
+        batch_op.drop_column('value_data')
@@ -0,0 +1,53 @@
+"""let the database fill in created_at
+
+Revision ID: created_at_server_default
+Revises: outline_json_jsonb
+Create Date: 2025-05-08 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'created_at_server_default'
+down_revision = 'outline_json_jsonb'
+branch_labels = None
+depends_on = None
+
+# Tables whose created_at is now set by the database rather than the app
+TABLES = [
+    'website_metrics',
+    'page_analytics',
+    'blog_posts',
+    'blog_post_sections',
+    'blog_post_versions',
+    'blog_post_seo_data',
+]
+
+
+def _set_created_at_default(server_default):
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for table in TABLES:
+        if table not in tables:
+            continue
+        if 'created_at' not in [col['name'] for col in inspector.get_columns(table)]:
+            continue
+        # Batch mode so SQLite, which cannot ALTER a column default, recreates the table
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                'created_at',
+                existing_type=sa.DateTime(),
+                server_default=server_default
+            )
+
+
+def upgrade():
+    _set_created_at_default(sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade():
+    _set_created_at_default(None)
@@ -0,0 +1,59 @@
+"""convert json columns to jsonb on postgresql
+
+Revision ID: jsonb_columns
+Revises: dc2cbd093295
+Create Date: 2025-05-05 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'jsonb_columns'
+down_revision = 'dc2cbd093295'
+branch_labels = None
+depends_on = None
+
+# Every column backed by JSONType, grouped by table
+JSON_COLUMNS = {
+    'blog_posts': ['generation_metadata'],
+    'blog_post_sections': ['section_metadata'],
+    'blog_post_versions': ['version_metadata'],
+    'blog_post_seo_data': ['analysis_data'],
+    'configurations': ['value_json'],
+    'keywords': ['keyword_metadata'],
+    'page_analytics': ['keywords'],
+    'scheduled_items': ['schedule_metadata'],
+    'social_posts': ['media_urls', 'hashtags', 'generation_metadata'],
+    'website_metrics': ['top_keywords', 'top_pages'],
+}
+
+
+def _alter_json_columns(target_type):
+    connection = op.get_bind()
+    # SQLite stores JSON as text either way; JSONB only exists on PostgreSQL
+    if connection.dialect.name != 'postgresql':
+        return
+
+    inspector = reflection.Inspector.from_engine(connection)
+    tables = inspector.get_table_names()
+
+    for table, columns in JSON_COLUMNS.items():
+        if table not in tables:
+            continue
+        existing = [col['name'] for col in inspector.get_columns(table)]
+        for column in columns:
+            if column in existing:
+                op.execute(
+                    f'ALTER TABLE {table} ALTER COLUMN {column} '
+                    f'TYPE {target_type} USING {column}::{target_type}'
+                )
+
+
+def upgrade():
+    _alter_json_columns('jsonb')
+
+
+def downgrade():
+    _alter_json_columns('json')
@@ -0,0 +1,43 @@
+"""index keywords by clicks for the top keyword lists on postgresql
+
+Revision ID: keyword_clicks_index
+Revises: keyword_ctr_computed
+Create Date: 2025-05-11 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'keyword_clicks_index'
+down_revision = 'keyword_ctr_computed'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_keywords_clicks_desc'
+
+
+def _keywords_index_names():
+    connection = op.get_bind()
+    # SQLite cannot declare NULLS LAST in an index, so this is PostgreSQL-only
+    if connection.dialect.name != 'postgresql':
+        return None
+
+    inspector = reflection.Inspector.from_engine(connection)
+    if 'keywords' not in inspector.get_table_names():
+        return None
+    return [index['name'] for index in inspector.get_indexes('keywords')]
+
+
+def upgrade():
+    existing = _keywords_index_names()
+    if existing is not None and INDEX_NAME not in existing:
+        op.create_index(INDEX_NAME, 'keywords', [sa.text('clicks DESC NULLS LAST')])
+
+
+def downgrade():
+    existing = _keywords_index_names()
+    if existing is not None and INDEX_NAME in existing:
+        op.drop_index(INDEX_NAME, table_name='keywords')
@@ -0,0 +1,51 @@
+"""let the database fill in keyword and configuration timestamps
+
+Revision ID: keyword_configuration_server_timestamps
+Revises: configuration_value_data
+Create Date: 2025-05-14 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'keyword_configuration_server_timestamps'
+down_revision = 'configuration_value_data'
+branch_labels = None
+depends_on = None
+
+# Timestamp columns now set by the database rather than the app, by table
+COLUMNS = {
+    'keywords': ['created_at'],
+    'configurations': ['created_at', 'updated_at'],
+}
+
+
+def _set_timestamp_defaults(server_default):
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for table, timestamp_columns in COLUMNS.items():
+        if table not in tables:
+            continue
+        existing = [col['name'] for col in inspector.get_columns(table)]
+        # Batch mode so SQLite, which cannot ALTER a column default, recreates the table
+        with op.batch_alter_table(table) as batch_op:
+            for column in timestamp_columns:
+                if column not in existing:
+                    continue
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    server_default=server_default
+                )
+
+
+def upgrade():
+    _set_timestamp_defaults(sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade():
+    _set_timestamp_defaults(None)
@@ -0,0 +1,58 @@
+"""compute keywords.ctr in the database
+
+Revision ID: keyword_ctr_computed
+Revises: configuration_key_pattern_index
+Create Date: 2025-05-10 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'keyword_ctr_computed'
+down_revision = 'configuration_key_pattern_index'
+branch_labels = None
+depends_on = None
+
+# Same expression as Keyword.ctr
+CTR_EXPRESSION = (
+    "CASE WHEN impressions > 0 "
+    "THEN ROUND(COALESCE(clicks, 0) * 100.0 / impressions, 2) ELSE 0 END"
+)
+
+
+def _ctr_column():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'keywords' not in inspector.get_table_names():
+        return None
+    for column in inspector.get_columns('keywords'):
+        if column['name'] == 'ctr':
+            return column
+    return None
+
+
+def upgrade():
+    column = _ctr_column()
+    if column is None or column.get('computed'):
+        return
+
+    # A plain column cannot be turned into a generated one in place, so
+    # replace it; batch mode recreates the table on SQLite
+    with op.batch_alter_table('keywords') as batch_op:
+        batch_op.drop_column('ctr')
+    with op.batch_alter_table('keywords') as batch_op:
+        batch_op.add_column(sa.Column('ctr', sa.Float(), sa.Computed(CTR_EXPRESSION, persisted=True)))
+
+
+def downgrade():
+    column = _ctr_column()
+    if column is None or not column.get('computed'):
+        return
+
+    with op.batch_alter_table('keywords') as batch_op:
+        batch_op.drop_column('ctr')
+    with op.batch_alter_table('keywords') as batch_op:
+        batch_op.add_column(sa.Column('ctr', sa.Float(), nullable=True))
+    op.execute(f'UPDATE keywords SET ctr = {CTR_EXPRESSION}')
@@ -0,0 +1,50 @@
+"""add a trigram index for keyword search on postgresql
+
+Revision ID: keyword_trigram_index
+Revises: keyword_clicks_index
+Create Date: 2025-05-12 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'keyword_trigram_index'
+down_revision = 'keyword_clicks_index'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_keywords_keyword_trgm'
+
+
+def _keywords_index_names():
+    connection = op.get_bind()
+    # pg_trgm only exists on PostgreSQL; other dialects keep the sequential scan
+    if connection.dialect.name != 'postgresql':
+        return None
+
+    inspector = reflection.Inspector.from_engine(connection)
+    if 'keywords' not in inspector.get_table_names():
+        return None
+    return [index['name'] for index in inspector.get_indexes('keywords')]
+
+
+def upgrade():
+    existing = _keywords_index_names()
+    if existing is None or INDEX_NAME in existing:
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        INDEX_NAME, 'keywords', ['keyword'],
+        postgresql_using='gin',
+        postgresql_ops={'keyword': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    existing = _keywords_index_names()
+    if existing is not None and INDEX_NAME in existing:
+        # The extension is left installed; other objects may depend on it
+        op.drop_index(INDEX_NAME, table_name='keywords')
@@ -0,0 +1,42 @@
+"""store blog_posts.outline_json as jsonb on postgresql
+
+Revision ID: outline_json_jsonb
+Revises: website_metrics_covering_index
+Create Date: 2025-05-07 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'outline_json_jsonb'
+down_revision = 'website_metrics_covering_index'
+branch_labels = None
+depends_on = None
+
+
+def _alter_outline_column(target_type):
+    connection = op.get_bind()
+    # SQLite keeps JSON as text, so the existing column already works there
+    if connection.dialect.name != 'postgresql':
+        return
+
+    inspector = reflection.Inspector.from_engine(connection)
+    if 'blog_posts' not in inspector.get_table_names():
+        return
+    if 'outline_json' not in [col['name'] for col in inspector.get_columns('blog_posts')]:
+        return
+
+    op.execute(
+        f'ALTER TABLE blog_posts ALTER COLUMN outline_json '
+        f'TYPE {target_type} USING outline_json::{target_type}'
+    )
+
+
+def upgrade():
+    _alter_outline_column('jsonb')
+
+
+def downgrade():
+    _alter_outline_column('text')
@@ -0,0 +1,39 @@
+"""let the database fill in scheduled_items.created_at
+
+Revision ID: scheduled_items_created_at_server_default
+Revises: social_posts_status_platform_indexes
+Create Date: 2025-05-23 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_created_at_server_default'
+down_revision = 'social_posts_status_platform_indexes'
+branch_labels = None
+depends_on = None
+
+
+def _set_created_at_default(server_default):
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return
+
+    # Batch mode so SQLite, which cannot ALTER a column default, recreates the table
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        batch_op.alter_column(
+            'created_at',
+            existing_type=sa.DateTime(),
+            server_default=server_default
+        )
+
+
+def upgrade():
+    _set_created_at_default(sa.text('CURRENT_TIMESTAMP'))
+
+
+def downgrade():
+    _set_created_at_default(None)
@@ -0,0 +1,49 @@
+"""index scheduled items for the due-items poll
+
+Revision ID: scheduled_items_due_indexes
+Revises: keyword_configuration_server_timestamps
+Create Date: 2025-05-15 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_due_indexes'
+down_revision = 'keyword_configuration_server_timestamps'
+branch_labels = None
+depends_on = None
+
+# Indexes serving ScheduledItem.get_due_items, by name
+INDEXES = {
+    'ix_scheduled_items_status_next_execution': ['status', 'next_execution'],
+    'ix_scheduled_items_status_scheduled_time': ['status', 'scheduled_time'],
+}
+
+
+def _index_names():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return None
+    return [index['name'] for index in inspector.get_indexes('scheduled_items')]
+
+
+def upgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'scheduled_items', columns)
+
+
+def downgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='scheduled_items')
@@ -0,0 +1,70 @@
+"""check that scheduled items are scheduled after they were created
+
+Revision ID: scheduled_items_future_time_check
+Revises: scheduled_items_single_target_check
+Create Date: 2025-05-21 10:00:00
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_future_time_check'
+down_revision = 'scheduled_items_single_target_check'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT_NAME = 'ck_scheduled_items_future_time'
+CONDITION = 'scheduled_time > created_at'
+
+
+def _check_names():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return None
+    return [check['name'] for check in inspector.get_check_constraints('scheduled_items')]
+
+
+def upgrade():
+    existing = _check_names()
+    if existing is None or CONSTRAINT_NAME in existing:
+        return
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # NOT VALID checks new and updated rows without rejecting legacy ones
+        op.execute(
+            f"ALTER TABLE scheduled_items ADD CONSTRAINT {CONSTRAINT_NAME} "
+            f"CHECK ({CONDITION}) NOT VALID"
+        )
+        return
+
+    # SQLite has no NOT VALID: rebuilding the table re-checks every row, so
+    # legacy rows scheduled before their creation would abort the upgrade.
+    # Leave the table as is then rather than deleting anyone's schedules.
+    violations = op.get_bind().execute(
+        sa.text(f"SELECT COUNT(*) FROM scheduled_items WHERE NOT ({CONDITION})")
+    ).scalar()
+    if violations:
+        logger.warning(
+            f"Skipping {CONSTRAINT_NAME}: {violations} existing scheduled items "
+            f"violate {CONDITION}"
+        )
+        return
+
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        batch_op.create_check_constraint(CONSTRAINT_NAME, CONDITION)
+
+
+def downgrade():
+    existing = _check_names()
+    if existing is None or CONSTRAINT_NAME not in existing:
+        return
+
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        batch_op.drop_constraint(CONSTRAINT_NAME, type_='check')
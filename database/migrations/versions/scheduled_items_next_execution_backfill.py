@@ -0,0 +1,57 @@
+"""backfill next_execution on pending scheduled items
+
+Revision ID: scheduled_items_next_execution_backfill
+Revises: scheduled_items_due_indexes
+Create Date: 2025-05-16 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_next_execution_backfill'
+down_revision = 'scheduled_items_due_indexes'
+branch_labels = None
+depends_on = None
+
+# Only served the scheduled_time fallback that the backfill makes redundant
+FALLBACK_INDEX = 'ix_scheduled_items_status_scheduled_time'
+
+
+def _inspector():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return None
+    return inspector
+
+
+def upgrade():
+    inspector = _inspector()
+    if inspector is None:
+        return
+
+    # Legacy pending rows were written without a next_execution and fell back to
+    # scheduled_time; copy it over so get_due_items needs a single range predicate.
+    # The status enum is stored by member name.
+    op.execute(sa.text(
+        "UPDATE scheduled_items SET next_execution = scheduled_time "
+        "WHERE next_execution IS NULL AND status = 'PENDING'"
+    ))
+
+    existing = [index['name'] for index in inspector.get_indexes('scheduled_items')]
+    if FALLBACK_INDEX in existing:
+        op.drop_index(FALLBACK_INDEX, table_name='scheduled_items')
+
+
+def downgrade():
+    # The backfilled values are still correct for the old fallback, so only the
+    # index comes back
+    inspector = _inspector()
+    if inspector is None:
+        return
+
+    existing = [index['name'] for index in inspector.get_indexes('scheduled_items')]
+    if FALLBACK_INDEX not in existing:
+        op.create_index(FALLBACK_INDEX, 'scheduled_items', ['status', 'scheduled_time'])
@@ -0,0 +1,53 @@
+"""replace the scheduled items status index with a partial index on pending rows
+
+Revision ID: scheduled_items_pending_index
+Revises: scheduled_items_string_enums
+Create Date: 2025-05-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_pending_index'
+down_revision = 'scheduled_items_string_enums'
+branch_labels = None
+depends_on = None
+
+PENDING_INDEX = 'ix_scheduled_items_pending_next_execution'
+STATUS_INDEX = 'ix_scheduled_items_status_next_execution'
+PENDING_ONLY = sa.text("status = 'pending'")
+
+
+def _index_names():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return None
+    return [index['name'] for index in inspector.get_indexes('scheduled_items')]
+
+
+def upgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    if PENDING_INDEX not in existing:
+        op.create_index(
+            PENDING_INDEX, 'scheduled_items', ['next_execution'],
+            postgresql_where=PENDING_ONLY, sqlite_where=PENDING_ONLY
+        )
+    if STATUS_INDEX in existing:
+        op.drop_index(STATUS_INDEX, table_name='scheduled_items')
+
+
+def downgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    if STATUS_INDEX not in existing:
+        op.create_index(STATUS_INDEX, 'scheduled_items', ['status', 'next_execution'])
+    if PENDING_INDEX in existing:
+        op.drop_index(PENDING_INDEX, table_name='scheduled_items')
@@ -0,0 +1,48 @@
+"""index the scheduled item post foreign keys
+
+Revision ID: scheduled_items_post_indexes
+Revises: scheduled_items_pending_index
+Create Date: 2025-05-19 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_post_indexes'
+down_revision = 'scheduled_items_pending_index'
+branch_labels = None
+depends_on = None
+
+# Foreign key columns neither database indexes on its own
+COLUMNS = ['blog_post_id', 'social_post_id']
+
+
+def _index_names():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return None
+    return [index['name'] for index in inspector.get_indexes('scheduled_items')]
+
+
+def upgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    for column in COLUMNS:
+        name = f'ix_scheduled_items_{column}'
+        if name not in existing:
+            op.create_index(name, 'scheduled_items', [column])
+
+
+def downgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    for column in COLUMNS:
+        name = f'ix_scheduled_items_{column}'
+        if name in existing:
+            op.drop_index(name, table_name='scheduled_items')
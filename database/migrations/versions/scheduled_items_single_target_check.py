@@ -0,0 +1,53 @@
+"""check that each scheduled item targets exactly one post
+
+Revision ID: scheduled_items_single_target_check
+Revises: scheduled_items_post_indexes
+Create Date: 2025-05-20 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_single_target_check'
+down_revision = 'scheduled_items_post_indexes'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT_NAME = 'ck_scheduled_items_single_target'
+CONDITION = '(blog_post_id IS NULL) <> (social_post_id IS NULL)'
+
+
+def _check_names():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'scheduled_items' not in inspector.get_table_names():
+        return None
+    return [check['name'] for check in inspector.get_check_constraints('scheduled_items')]
+
+
+def upgrade():
+    existing = _check_names()
+    if existing is None or CONSTRAINT_NAME in existing:
+        return
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # NOT VALID checks new and updated rows without rejecting legacy ones
+        op.execute(
+            f"ALTER TABLE scheduled_items ADD CONSTRAINT {CONSTRAINT_NAME} "
+            f"CHECK ({CONDITION}) NOT VALID"
+        )
+        return
+
+    # Batch mode so SQLite, which cannot add a constraint in place, recreates the table
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        batch_op.create_check_constraint(CONSTRAINT_NAME, CONDITION)
+
+
+def downgrade():
+    existing = _check_names()
+    if existing is None or CONSTRAINT_NAME not in existing:
+        return
+
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        batch_op.drop_constraint(CONSTRAINT_NAME, type_='check')
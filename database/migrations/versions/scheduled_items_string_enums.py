@@ -0,0 +1,75 @@
+"""store scheduled item status and frequency as plain strings
+
+Revision ID: scheduled_items_string_enums
+Revises: scheduled_items_next_execution_backfill
+Create Date: 2025-05-17 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'scheduled_items_string_enums'
+down_revision = 'scheduled_items_next_execution_backfill'
+branch_labels = None
+depends_on = None
+
+# Enum columns and their member names, keyed by the PostgreSQL type name
+COLUMNS = {
+    'status': ('schedulestatus', ['PENDING', 'COMPLETED', 'FAILED', 'CANCELLED']),
+    'frequency': ('schedulefrequency', ['ONCE', 'DAILY', 'WEEKLY', 'MONTHLY']),
+}
+
+
+def _has_table():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    return 'scheduled_items' in inspector.get_table_names()
+
+
+def upgrade():
+    if not _has_table():
+        return
+
+    connection = op.get_bind()
+    if connection.dialect.name == 'postgresql':
+        for column, (type_name, _) in COLUMNS.items():
+            op.execute(
+                f"ALTER TABLE scheduled_items ALTER COLUMN {column} "
+                f"TYPE VARCHAR(16) USING lower({column}::text)"
+            )
+            op.execute(f"DROP TYPE IF EXISTS {type_name}")
+        return
+
+    # SQLite keeps the enum as VARCHAR already; widen it and switch from the
+    # member names to the values
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        for column in COLUMNS:
+            batch_op.alter_column(column, existing_nullable=False, type_=sa.String(16))
+    for column in COLUMNS:
+        op.execute(f"UPDATE scheduled_items SET {column} = lower({column})")
+
+
+def downgrade():
+    if not _has_table():
+        return
+
+    for column in COLUMNS:
+        op.execute(f"UPDATE scheduled_items SET {column} = upper({column})")
+
+    connection = op.get_bind()
+    if connection.dialect.name == 'postgresql':
+        for column, (type_name, members) in COLUMNS.items():
+            sa.Enum(*members, name=type_name).create(connection)
+            op.execute(
+                f"ALTER TABLE scheduled_items ALTER COLUMN {column} "
+                f"TYPE {type_name} USING {column}::{type_name}"
+            )
+        return
+
+    with op.batch_alter_table('scheduled_items') as batch_op:
+        for column, (type_name, members) in COLUMNS.items():
+            batch_op.alter_column(
+                column, existing_nullable=False, type_=sa.Enum(*members, name=type_name)
+            )
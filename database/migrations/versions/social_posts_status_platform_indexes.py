@@ -0,0 +1,50 @@
+"""index social posts by status, scheduled time and platform
+
+Revision ID: social_posts_status_platform_indexes
+Revises: scheduled_items_future_time_check
+Create Date: 2025-05-22 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'social_posts_status_platform_indexes'
+down_revision = 'scheduled_items_future_time_check'
+branch_labels = None
+depends_on = None
+
+# The composite index also answers status-only lookups, so status gets no
+# index of its own
+INDEXES = {
+    'ix_social_posts_status_scheduled_at': ['status', 'scheduled_at'],
+    'ix_social_posts_platform': ['platform'],
+}
+
+
+def _index_names():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'social_posts' not in inspector.get_table_names():
+        return None
+    return [index['name'] for index in inspector.get_indexes('social_posts')]
+
+
+def upgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'social_posts', columns)
+
+
+def downgrade():
+    existing = _index_names()
+    if existing is None:
+        return
+
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='social_posts')
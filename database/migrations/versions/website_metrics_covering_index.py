@@ -0,0 +1,54 @@
+"""replace the website_metrics date index with a covering index
+
+Revision ID: website_metrics_covering_index
+Revises: jsonb_columns
+Create Date: 2025-05-06 10:00:00
+
+"""
+from alembic import op
+from sqlalchemy.engine import reflection
+
+
+# revision identifiers, used by Alembic.
+revision = 'website_metrics_covering_index'
+down_revision = 'jsonb_columns'
+branch_labels = None
+depends_on = None
+
+# Columns read by WebsiteMetrics.get_aggregate_metrics
+INCLUDED_COLUMNS = [
+    'impressions', 'clicks', 'visitors', 'unique_visitors',
+    'bounce_rate', 'avg_session_duration', 'unique_keywords'
+]
+
+
+def _index_names(inspector):
+    return [index['name'] for index in inspector.get_indexes('website_metrics')]
+
+
+def upgrade():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'website_metrics' not in inspector.get_table_names():
+        return
+
+    existing = _index_names(inspector)
+    if 'ix_website_metrics_date_covering' not in existing:
+        # INCLUDE is PostgreSQL-only; other dialects get a plain index on date
+        op.create_index(
+            'ix_website_metrics_date_covering', 'website_metrics', ['date'],
+            postgresql_include=INCLUDED_COLUMNS
+        )
+    if 'ix_website_metrics_date' in existing:
+        op.drop_index('ix_website_metrics_date', table_name='website_metrics')
+
+
+def downgrade():
+    inspector = reflection.Inspector.from_engine(op.get_bind())
+    if 'website_metrics' not in inspector.get_table_names():
+        return
+
+    existing = _index_names(inspector)
+    if 'ix_website_metrics_date' not in existing:
+        op.create_index('ix_website_metrics_date', 'website_metrics', ['date'])
+    if 'ix_website_metrics_date_covering' in existing:
+        op.drop_index('ix_website_metrics_date_covering', table_name='website_metrics')
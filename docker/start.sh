@@ -13,4 +13,4 @@ flask db upgrade
 
 # Start Gunicorn server
 echo "Starting Gunicorn server..."
-gunicorn --bind 0.0.0.0:5000 --workers 4 --timeout 120 --log-level debug "wsgi:app"
+gunicorn --config gunicorn.conf.py "wsgi:app"
@@ -0,0 +1,42 @@
+"""
+Gunicorn configuration
+
+The backend is I/O bound (database and LM Studio calls), so workers default to
+gevent and each process multiplexes many in-flight requests. Set
+GUNICORN_WORKER_CLASS=gthread to fall back to threaded workers if a blocking
+C extension turns up in the stack.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))  # Only used by gthread workers
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'debug')
+
+# Build the app once in the master and share it copy-on-write with workers
+preload_app = True
+
+# Let wsgi.py know which worker class is in use so it can monkey-patch early
+os.environ['GUNICORN_WORKER_CLASS'] = worker_class
+# The app splits its DB_MAX_CONNECTIONS budget across this many worker pools
+os.environ['GUNICORN_WORKERS'] = str(workers)
+
+
+def post_fork(server, worker):
+    """Forget pooled DB connections inherited from the master.
+
+    The startup database probe runs in a background thread of the preloaded
+    app, so a fork can land while it still holds a connection. close=False
+    leaves the socket to the master instead of closing it from the child.
+    """
+    flask_app = getattr(server.app, 'callable', None)
+    if flask_app is None:
+        return
+
+    from app.extensions import db
+    with flask_app.app_context():
+        db.engine.dispose(close=False)